@@ -1,14 +1,57 @@
 import socket
-import json
+import selectors
+import orjson
 import threading
 import time
-from flask import Flask, jsonify, request
+import itertools
+import heapq
+import sched
+import struct
+from flask import Flask, request
+from flask.json.provider import JSONProvider
 from collections import deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
 import flask_cors
-import math
-import random
-import pickle
 import os
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+# Log records are handed to a queue and written by a listener thread, so threads
+# on the receive/dispatch paths never block on terminal or disk I/O.
+# LOGLEVEL=DEBUG enables per-device detail and the box banners; LOG_FILE sets the rotating log file.
+LOG_FILE = os.getenv("LOG_FILE", "basestation.log")
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+
+logger = logging.getLogger("basestation")
+_log_level = getattr(logging, os.getenv("LOGLEVEL", "INFO").upper(), None)
+logger.setLevel(_log_level if isinstance(_log_level, int) else logging.INFO)
+_log_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_log_queue))
+logger.propagate = False
+_log_formatter = logging.Formatter("[%(asctime)s] %(levelname)s: %(message)s")
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(_log_formatter)
+_log_file_handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, delay=True)
+_log_file_handler.setFormatter(_log_formatter)
+log_listener = QueueListener(_log_queue, _log_stream_handler, _log_file_handler)
+# Started at import so records are written however the module is loaded (script, WSGI server, tests)
+log_listener.start()
+atexit.register(log_listener.stop)
+if not isinstance(_log_level, int):
+    logger.warning("[SERVER] Unknown LOGLEVEL %r; using INFO", os.getenv("LOGLEVEL"))
+
+# Box-drawing banner borders, built once
+BANNER_RULE = "═" * 60
+DETECTION_BANNER_TOP = f"[DETECTION] ╔{BANNER_RULE}╗"
+DETECTION_BANNER_BOTTOM = f"[DETECTION] ╚{BANNER_RULE}╝"
+ASSIGNMENT_BANNER_TOP = f"[ASSIGNMENT] ╔{BANNER_RULE}╗"
+ASSIGNMENT_BANNER_BOTTOM = f"[ASSIGNMENT] ╚{BANNER_RULE}╝"
 
 
 def get_base_station_ip():
@@ -25,6 +68,18 @@ TCP_LISTEN_PORT = 9998  # Port for receiving connections FROM drones/robots
 TCP_ROBOT_PORT = 9999   # Port for sending commands TO robots
 UDP_PORT = 8888
 BUFFER_SIZE = 8192
+TCP_RECV_SIZE = 65536  # One read can take a whole burst of queued drone messages
+MAX_TCP_CLIENTS = 256  # Inbound device connections served at once; extras are refused
+UDP_BATCH_SIZE = 32  # Max datagrams drained from the UDP socket per wakeup
+# Compact POSITION_UPDATE datagram: tag byte, NUL-padded device_id, x, y, z (little-endian doubles)
+POSITION_UPDATE_TAG = 0x01
+POSITION_UPDATE_STRUCT = struct.Struct('<B32sddd')
+# Kernel keepalive probing for drone/robot connections: a silent peer is dropped after
+# ~KEEPIDLE + KEEPINTVL * KEEPCNT seconds, or TCP_USER_TIMEOUT_MS with unacked data
+TCP_KEEPIDLE_SEC = 20
+TCP_KEEPINTVL_SEC = 5
+TCP_KEEPCNT = 3
+TCP_USER_TIMEOUT_MS = 30000
 BASE_STATION_IP = get_base_station_ip()
 
 # Issue type to location mappings with predefined coordinates
@@ -60,12 +115,28 @@ connected_clients = {}
 clients_lock = threading.Lock()
 devices = {}
 devices_lock = threading.Lock()
-network_logs = []
-logs_lock = threading.Lock()
+devices_by_ip = {}  # Secondary index {ip: device_id}, guarded by devices_lock
+devices_by_category = defaultdict(set)  # {device_type_lc: {device_id, ...}}, guarded by devices_lock
+# Derived per-device keys, kept out of the device dicts so API payloads stay unchanged;
+# guarded by devices_lock
+device_types_lc = {}  # {device_id: lower-cased device_type}
+device_norm_ids = {}  # {device_id: ID shown by the frontend (DRONE_<ip digits> for drones)}
+free_robots = set()  # device_ids of robots with no task_id, guarded by devices_lock
+devices_by_task = {}  # {task_id: device_id} for devices with a task, guarded by devices_lock
+devices_version = 0  # Bumped on every device change, guarded by devices_lock
+DEVICE_TIMEOUT = 60  # seconds without an update before a device is dropped
+# Min-heap of (expiry deadline, device_id), one entry per known device; guarded by expiry_cv
+expiry_heap = []
+expiry_scheduled = set()
+expiry_cv = threading.Condition()
 MAX_LOGS = 500
-
-# Ensure only one dispatcher runs at a time to prevent over-assignment
-dispatch_lock = threading.Lock()
+network_logs = deque(maxlen=MAX_LOGS)  # Oldest entries are evicted on append
+logs_lock = threading.Lock()
+# log_packet only enqueues; flush_network_logs moves entries into network_logs in batches
+_packet_queue = queue.SimpleQueue()
+NETWORK_LOG_FLUSH_SEC = 0.05
+# Immutable copy of network_logs republished (under logs_lock) whenever it changes; readers need no lock
+network_logs_snapshot = ()
 
 # Throttle noisy position logs
 POSITION_LOG_INTERVAL = 5  # seconds
@@ -74,12 +145,16 @@ last_position_log = defaultdict(float)
 # Track detected issues with their locations and status
 detected_issues = {}  # Format: {issue_key: {"issue_type": "...", "coordinates": {...}, "timestamp": ..., "drone_id": "..."}}
 issues_lock = threading.Lock()
+issues_version = 0  # Bumped on every detected_issues change, guarded by issues_lock
 # Track multi-stage progress per issue (e.g., overheated_circuit TYPE1 -> TYPE2)
 issue_progress = {}  # Format: {issue_key: stage_index}
 
 # Queue to hold pending issues when no robots are available
 pending_issues = deque()  # Each item: {issue_key, issue_type, coordinates, api_data, robot_count, enqueued_at}
-pending_lock = threading.Lock()
+pending_keys = set()  # issue_keys currently in pending_issues, for O(1) duplicate checks
+# Guards pending_issues, pending_keys and dispatch_requested; notified whenever a dispatch pass may make progress
+pending_cv = threading.Condition()
+dispatch_requested = False
 
 # Track which robots have been assigned to which issues (prevent duplicate assignments)
 issue_assignments = {}  # Format: {issue_key: [robot_id1, robot_id2, ...]}
@@ -90,20 +165,167 @@ current_active_issue = None  # Stores the issue_key currently being worked on
 active_issue_lock = threading.Lock()
 
 # Command logs for tracking drone/robot control commands
-command_logs = []  # Format: {drone_id, command, base_station_ip, timestamp}
+MAX_COMMAND_LOGS = 200
+command_logs = deque(maxlen=MAX_COMMAND_LOGS)  # Format: {drone_id, command, base_station_ip, timestamp}
 command_logs_lock = threading.Lock()
 
+# Idle outbound connections to drones/robots are pooled (see RobotSocketPool below)
+ROBOT_POOL_MAX_IDLE = 1       # Robots serve one inbound connection at a time
+ROBOT_POOL_IDLE_TIMEOUT = 30  # seconds before an unused pooled socket is closed
+ROBOT_POOL_SWEEP_SEC = 10
+ROBOT_SOCKET_TIMEOUT = 2      # connect and send timeout on robot sockets
+# Slowest path through send_on_robot_conn: a send on a stale pooled socket times out,
+# then a fresh connect and a send on the new socket each use their full timeout
+ROBOT_SEND_WORST_CASE = 3 * ROBOT_SOCKET_TIMEOUT
+
+# Movement commands to the robots of one issue are sent concurrently
+movement_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="mv")
+# Never give up on a send that can still reach the robot: a late success would leave
+# it BUSY but missing from issue_assignments. Covers waiting out another send to the
+# same robot (see send_on_robot_conn) plus this send's own worst case.
+MOVEMENT_SEND_TIMEOUT = 2 * ROBOT_SEND_WORST_CASE + 2
+# Broadcasts fan out on their own pool so they never queue behind movement commands
+forward_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="fwd")
+
+HTTP_THREADS = 8  # waitress worker threads for the dashboard API
+
+# Message ids are "<startup ms>-<sequence>": unique within a run, and the prefix keeps
+# ids from a restarted base station distinct from ones robots may still hold
+_message_id_prefix = int(time.time() * 1000)
+_message_seq = itertools.count()
+
 # ==================== SIMPLE ROBOT SELECTION ====================
 # (see unified implementation further below)
-MAX_COMMAND_LOGS = 200
+
+class OrjsonProvider(JSONProvider):
+    """Route Flask's own JSON handling (request.get_json) through orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 flask_cors.CORS(app)
 
 
-def log_packet(direction, transport, packet_type, message_type, sender_id, receiver_id, payload):
+def fastjson(obj):
+    """Build a JSON response with orjson (the payload must only have str dict keys)"""
+    return app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+
+# Encoded bodies of the dashboard's polled endpoints: {name: (built_at, version, body)}
+API_CACHE_TTL = 0.25  # seconds
+_api_cache = {}
+
+
+def cached_json(name, version, build):
+    """
+    Serve the cached body for `name` while its data version is unchanged, or for
+    API_CACHE_TTL after a change so concurrent pollers share one build.
+    """
+    now = time.monotonic()
+    hit = _api_cache.get(name)
+    if hit and (hit[1] == version or now - hit[0] < API_CACHE_TTL):
+        body = hit[2]
+    else:
+        body = orjson.dumps(build())
+        _api_cache[name] = (now, version, body)
+    return app.response_class(body, mimetype="application/json")
+
+
+def _devices_changed():
+    """Invalidate cached device responses (hold devices_lock)"""
+    global devices_version
+    devices_version += 1
+
+
+def _issues_changed():
+    """Invalidate cached issue responses (hold issues_lock)"""
+    global issues_version
+    issues_version += 1
+
+
+def _add_device(device_id, entry):
+    """Insert or replace a device and keep the secondary indexes in sync (hold devices_lock)"""
+    old = devices.get(device_id)
+    if old and old.get("ip") != entry.get("ip") and devices_by_ip.get(old.get("ip")) == device_id:
+        del devices_by_ip[old.get("ip")]
+    if old:
+        devices_by_category[device_types_lc[device_id]].discard(device_id)
+        if devices_by_task.get(old.get("task_id")) == device_id:
+            del devices_by_task[old["task_id"]]
+    # Derived keys the API endpoints need, computed once here rather than per request
+    type_lc = str(entry.get("device_type", "")).lower()
+    ip = entry.get("ip")
+    device_types_lc[device_id] = type_lc
+    device_norm_ids[device_id] = f"DRONE_{ip.replace('.', '')}" if type_lc == "drone" and ip else device_id
+    devices[device_id] = entry
+    devices_by_category[type_lc].add(device_id)
+    if entry.get("ip"):
+        devices_by_ip[entry["ip"]] = device_id
+    _set_task(device_id, entry, entry.get("task_id"))
+    _devices_changed()
+    _schedule_expiry(device_id, entry.get("updated_at", time.time()) + DEVICE_TIMEOUT)
+
+
+def _schedule_expiry(device_id, deadline):
+    """Make sure cleanup_stale_devices will look at device_id by `deadline`"""
+    with expiry_cv:
+        if device_id in expiry_scheduled:
+            # The existing entry fires no later than this one and is rescheduled from updated_at
+            return
+        expiry_scheduled.add(device_id)
+        heapq.heappush(expiry_heap, (deadline, device_id))
+        expiry_cv.notify()
+
+
+def _remove_device(device_id):
+    """Remove a device and its secondary index entries (hold devices_lock). Returns the entry or None."""
+    dev = devices.pop(device_id, None)
+    if dev and devices_by_ip.get(dev.get("ip")) == device_id:
+        del devices_by_ip[dev.get("ip")]
+    if dev:
+        devices_by_category[device_types_lc.pop(device_id)].discard(device_id)
+        device_norm_ids.pop(device_id, None)
+        if devices_by_task.get(dev.get("task_id")) == device_id:
+            del devices_by_task[dev["task_id"]]
+    free_robots.discard(device_id)
+    _devices_changed()
+    return dev
+
+
+def _set_task(device_id, dev, task_id):
+    """Set or clear a device's task_id and keep free_robots and devices_by_task in sync (hold devices_lock)"""
+    old = dev.get("task_id")
+    if old and devices_by_task.get(old) == device_id:
+        del devices_by_task[old]
+    if task_id:
+        devices_by_task[task_id] = device_id
+    dev["task_id"] = task_id
+    _devices_changed()
+    if not task_id and device_types_lc.get(device_id) == "robot":
+        free_robots.add(device_id)
+    else:
+        free_robots.discard(device_id)
+
+
+def _issue_key(issue_type, coordinates):
+    """Key identifying an issue by type and location (10 and 10.0 compare and hash equal)"""
+    return (issue_type, coordinates.get('x', 0), coordinates.get('y', 0), coordinates.get('z', 0))
+
+
+def new_message_id():
+    """Unique message id from the process-wide sequence (next() on a count is atomic)"""
+    return f"{_message_id_prefix}-{next(_message_seq)}"
+
+
+def log_packet(direction, transport, packet_type, message_type, sender_id, receiver_id, payload, timestamp=None):
     entry = {
-        "timestamp": time.time(),
+        "timestamp": timestamp if timestamp is not None else time.time(),
         "direction": direction,
         "transport": transport,
         "packet_type": packet_type,
@@ -112,16 +334,36 @@ def log_packet(direction, transport, packet_type, message_type, sender_id, recei
         "receiver_id": receiver_id,
         "payload": payload,
     }
+    _packet_queue.put(entry)
+
+
+def flush_network_logs():
+    """Move queued log_packet entries into network_logs with one logs_lock acquire"""
+    global network_logs_snapshot
+    # Drain under logs_lock so a concurrent clear can't be undone by a batch taken before it
     with logs_lock:
-        network_logs.append(entry)
-        if len(network_logs) > MAX_LOGS:
-            del network_logs[:-MAX_LOGS]
+        batch = _drain_packet_queue()
+        if batch:
+            network_logs.extend(batch)
+            network_logs_snapshot = tuple(network_logs)
 
 
-def build_message(message_type, receiver_category, receiver_ip, message_content, sender_ip):
-    timestamp = time.time()
+def _drain_packet_queue():
+    """Take every entry log_packet has queued so far (callers hold logs_lock)"""
+    batch = []
+    try:
+        while True:
+            batch.append(_packet_queue.get_nowait())
+    except queue.Empty:
+        pass
+    return batch
+
+
+def build_message(message_type, receiver_category, receiver_ip, message_content, sender_ip, timestamp=None):
+    if timestamp is None:
+        timestamp = time.time()
     return {
-        "message_id": f"{int(timestamp * 1000000)}",
+        "message_id": new_message_id(),
         "timestamp": timestamp,
         "message_type": message_type,
         "receiver_category": receiver_category,
@@ -131,10 +373,11 @@ def build_message(message_type, receiver_category, receiver_ip, message_content,
     }
 
 
-def connection_ack_signal(receiver_id, receiver_ip):
-    timestamp = time.time()
+def connection_ack_signal(receiver_id, receiver_ip, timestamp=None):
+    if timestamp is None:
+        timestamp = time.time()
     return {
-        "message_id": f"{int(timestamp * 1000000)}",
+        "message_id": new_message_id(),
         "timestamp": timestamp,
         "message_type": "CONNECTION_ACK",
         "base_station_ip": BASE_STATION_IP,
@@ -142,288 +385,520 @@ def connection_ack_signal(receiver_id, receiver_ip):
         "receiver_ip": receiver_ip
     }
 
+def enable_tcp_keepalive(sock):
+    """Turn on SO_KEEPALIVE with tuned probe timings where the platform supports them"""
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    for opt, value in (("TCP_KEEPIDLE", TCP_KEEPIDLE_SEC),
+                       ("TCP_KEEPINTVL", TCP_KEEPINTVL_SEC),
+                       ("TCP_KEEPCNT", TCP_KEEPCNT),
+                       ("TCP_USER_TIMEOUT", TCP_USER_TIMEOUT_MS)):
+        if hasattr(socket, opt):
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, opt), value)
+            except OSError:
+                pass
+
+
 def tcp_server():
+    """Single-threaded selector loop serving every drone/robot TCP connection"""
     try:
         server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         server_sock.bind(("0.0.0.0", TCP_LISTEN_PORT))
         server_sock.listen(10)
-        print(f"[SERVER] TCP server listening on port {TCP_LISTEN_PORT}")
-        
+        server_sock.setblocking(False)
+        logger.info("[SERVER] TCP server listening on port %s", TCP_LISTEN_PORT)
+
+        sel = selectors.DefaultSelector()
+        sel.register(server_sock, selectors.EVENT_READ, None)
+
         while True:
             try:
-                client_sock, addr = server_sock.accept()
-                client_ip = addr[0]
-                
-                with clients_lock:
-                    connected_clients[client_ip] = {
-                        "socket": client_sock,
-                        "connected_at": time.time()
-                    }
-                print(f"[TCP] Client connected: {client_ip}")
-                threading.Thread(
-                    target=handle_tcp_client, 
-                    args=(client_sock, client_ip), 
-                    daemon=True
-                ).start() 
+                events = sel.select(timeout=1.0)
             except Exception as e:
-                print(f"[TCP] Error accepting connection: {e}")
+                logger.error("[TCP] Selector error: %s", e)
+                continue
+            for key, _ in events:
+                if key.data is None:
+                    accept_tcp_client(sel, server_sock)
+                else:
+                    handle_tcp_readable(sel, key.data)
     except Exception as e:
-        print(f"[TCP] Server error: {e}")
+        logger.error("[TCP] Server error: %s", e)
 
 
-def handle_tcp_client(client_sock, client_ip):
-    """Handle persistent TCP connection from drone/robot (newline-delimited JSON)"""
-    # Set timeout so recv() doesn't block forever
-    client_sock.settimeout(120)  # 2 minute timeout for detecting dead connections
-    
+def accept_tcp_client(sel, server_sock):
+    """Accept a pending connection and register it with the selector"""
     try:
-        buffer = ""
-        print(f"[TCP] ✓ Successfully accepted connection from {client_ip}")
-        print(f"[TCP] Waiting for data from {client_ip}...")
-        
-        while True:
-            try:
-                # Receive data with timeout
-                data = client_sock.recv(BUFFER_SIZE)
-                
-                # Empty data means the remote closed the connection
-                if not data:
-                    print(f"[TCP] ✗ Client {client_ip} closed connection (received 0 bytes)")
-                    print(f"[TCP] This usually means:")
-                    print(f"[TCP]   1. Client connected but never sent data")
-                    print(f"[TCP]   2. Client encountered an error before sending")
-                    print(f"[TCP]   3. Port conflict (client listening on same port it's trying to connect from)")
-                    break
-                
-                print(f"[TCP] ✓ Received {len(data)} bytes from {client_ip}")
-                
-                # Decode and add to buffer
-                buffer += data.decode('utf-8', errors='ignore')
-                
-                # Process complete messages (separated by newlines)
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
-                    line = line.strip()
-                    
-                    if not line:
-                        continue
-                    
-                    try:
-                        msg = json.loads(line)
-                        message_type = msg.get('message_type', 'UNKNOWN')
-                        sender_id = msg.get('sender_id') or client_ip
-                        print(f"[TCP] Received from {client_ip}: {message_type}")
-                        
-                        # If this is a QR code scan from drone, automatically assign robots
-                        if message_type == "QR_SCAN":
-                            content = msg.get('content', {})
-                            qr_code = content.get('qr_code')
-                            api_data = content.get('api_data', {})
-                            issue_type = content.get('issue_type')
-                            coordinates = content.get('coordinates', {})
-                            
-                            # Store detected issue with actual coordinates from drone (skip duplicates)
-                            if issue_type and coordinates:
-                                issue_key = f"{issue_type}_{coordinates.get('x', 0)}_{coordinates.get('y', 0)}_{coordinates.get('z', 0)}"
-                                
-                                with issues_lock:
-                                    if issue_key in detected_issues:
-                                        print(f"[ISSUE] ⚠️ Duplicate issue ignored: {issue_type} at {coordinates} (already exists)")
-                                    else:
-                                        detected_issues[issue_key] = {
-                                            "issue_type": issue_type,
-                                            "coordinates": coordinates,
-                                            "timestamp": time.time(),
-                                            "drone_id": sender_id,
-                                            "api_data": api_data
-                                        }
-                                        print(f"[ISSUE] ✓ Stored NEW issue: {issue_type} at coordinates {coordinates}")
-                                        print(f"[ISSUE] Total issues in system: {len(detected_issues)}")
-                            else:
-                                print(f"[ISSUE] ✗ Missing issue_type or coordinates - issue_type={issue_type}, coordinates={coordinates}")
-                            
-                            if issue_type:
-                                
-                                print(f"\n[DETECTION] ╔════════════════════════════════════════════════════════════╗")
-                                print(f"[DETECTION] ║ QR CODE SCANNED BY DRONE                                      ║")
-                                print(f"[DETECTION] ║ Issue Type: {issue_type.upper():<43} ║")
-                                print(f"[DETECTION] ║ QR Code: {qr_code:<53} ║")
-                                print(f"[DETECTION] ║ API Data: {str(api_data):<49} ║")
-                                print(f"[DETECTION] ║ Location: X={coordinates.get('x', 0)}, Y={coordinates.get('y', 0)}, Z={coordinates.get('z', 0):<20} ║")
-                                print(f"[DETECTION] ║ Sender: {sender_id:<52} ║")
-                                print(f"[DETECTION] ║ Time: {time.strftime('%Y-%m-%d %H:%M:%S'):<50} ║")
-                                print(f"[DETECTION] ╚════════════════════════════════════════════════════════════╝\n")
-                                
-                                try:
-                                    handle_issue_detection(issue_type, coordinates, api_data)
-                                except Exception as e:
-                                    print(f"[TCP] ✗ Error in handle_issue_detection: {e}")
-                                    import traceback
-                                    traceback.print_exc()
-                        elif message_type == "TASK_COMPLETED":
-                            content = msg.get('content', {})
-                            task_id = content.get('task_id') or msg.get('message_id')
-                            issue_type = content.get('issue_type')
-                            coordinates = content.get('coordinates', {})
-                            status = content.get('status')
-                            message = content.get('message')
-                            stage = content.get('stage', 0)
-
-                            freed = False
-                            # Prefer freeing by matching task_id to avoid freeing multiple robots by IP
-                            with devices_lock:
-                                # Find robot with this task_id
-                                target_robot_id = None
-                                for dev_id, dev in devices.items():
-                                    if dev.get("task_id") == task_id and dev.get("device_type", "").lower() == "robot":
-                                        target_robot_id = dev_id
-                                        break
-                                # Fallbacks if not found: sender_id, then IP (single match)
-                                candidates = []
-                                if target_robot_id:
-                                    candidates = [target_robot_id]
-                                elif sender_id in devices:
-                                    candidates = [sender_id]
-                                else:
-                                    for dev_id, dev in devices.items():
-                                        if dev.get("ip") == client_ip and dev.get("device_type", "").lower() == "robot":
-                                            candidates = [dev_id]
-                                            break
-
-                                for dev_id in candidates:
-                                    dev = devices.get(dev_id)
-                                    if not dev:
-                                        continue
-                                    dev["task_id"] = None
-                                    dev["current_task"] = None
-                                    dev["status"] = "READY"
-                                    dev["updated_at"] = time.time()
-                                    freed = True
-                                    print(f"[TASK] ✓ Task completed by {dev_id} (status={status}, task_id={task_id}, stage={stage})")
-                                    print(f"[TASK] ✓ Robot is now available for new assignments")
-                                    
-                                    if issue_type and coordinates:
-                                        issue_key = f"{issue_type}_{coordinates.get('x', 0)}_{coordinates.get('y', 0)}_{coordinates.get('z', 0)}"
-
-                                        # Clean up assignment tracking for this robot
-                                        with assignments_lock:
-                                            if issue_key in issue_assignments:
-                                                if dev_id in issue_assignments[issue_key]:
-                                                    issue_assignments[issue_key].remove(dev_id)
-                                                    print(f"[TASK] Removed {dev_id} from assignment tracking for {issue_key}")
-                                                if not issue_assignments[issue_key]:
-                                                    del issue_assignments[issue_key]
-                                                    print(f"[TASK] Cleaned up assignment tracking for completed issue {issue_key}")
-
-                                        # Determine if multi-stage and enqueue next stage if needed
-                                        with issues_lock:
-                                            progress = issue_progress.get(issue_key)
-                                            required_robot_types = []
-                                            if progress:
-                                                required_robot_types = progress.get("required_robot_types") or []
-                                            elif issue_type in ISSUE_LOCATIONS:
-                                                info = ISSUE_LOCATIONS[issue_type]
-                                                rrt = info.get("required_robot_types") or ([] if not info.get("required_robot_type") else [info.get("required_robot_type")])
-                                                required_robot_types = rrt
-                                            staged = bool(required_robot_types)
-                                            if staged:
-                                                issue_progress[issue_key] = {
-                                                    "required_robot_types": required_robot_types,
-                                                    "current_stage": stage
-                                                }
-                                        next_stage = stage + 1
-                                        final_stage = not bool(required_robot_types) or next_stage >= len(required_robot_types)
-
-                                        if final_stage:
-                                            with issues_lock:
-                                                if issue_key in detected_issues:
-                                                    del detected_issues[issue_key]
-                                                    print(f"[ISSUE] Removed resolved issue: {issue_type} at {coordinates}")
-                                                if issue_key in issue_progress:
-                                                    del issue_progress[issue_key]
-                                                    print(f"[ISSUE] Cleared progress tracking for {issue_key}")
-                                            # Clear active issue when completely finished
-                                            with active_issue_lock:
-                                                if globals().get('current_active_issue') == issue_key:
-                                                    globals()['current_active_issue'] = None
-                                                    print(f"[TASK] ✓ Issue {issue_key} fully completed. Cleared active issue. Ready for next issue.")
-                                        else:
-                                            print(f"[TASK] Staged issue: enqueuing next stage {next_stage} for {issue_key}")
-                                            enqueue_issue(
-                                                issue_key,
-                                                issue_type,
-                                                coordinates,
-                                                api_data={},
-                                                robot_count=1,
-                                                required_robot_type=required_robot_types[next_stage],
-                                                required_robot_types=required_robot_types,
-                                                stage=next_stage,
-                                            )
-                                            process_issue_queue()
-                            # Attempt to dispatch any queued issues now that a robot freed up
-                            if freed:
-                                process_issue_queue()
-
-                            if not freed:
-                                print(f"[TASK] ⚠ Received TASK_COMPLETED from unknown device {sender_id} / {client_ip}")
-
-                            log_packet(
-                                direction="in",
-                                transport="TCP",
-                                packet_type="STATUS",
-                                message_type="TASK_COMPLETED",
-                                sender_id=sender_id,
-                                receiver_id="base_station",
-                                payload=msg,
-                            )
-                        
-                        log_packet(
-                            direction="in",
-                            transport="TCP",
-                            packet_type="MESSAGE",
-                            message_type=message_type,
-                            sender_id=sender_id,
-                            receiver_id="base_station",
-                            payload=msg,
-                        )
-                    except json.JSONDecodeError as e:
-                        print(f"[TCP] Failed to parse JSON from {client_ip}: {e}")
-                    except Exception as e:
-                        print(f"[TCP] ✗ Error processing message from {client_ip}: {e}")
-                        import traceback
-                        traceback.print_exc()
-                    
-            except socket.timeout:
-                # Timeout waiting for data is normal for idle connections
-                # Just continue waiting for more data
-                continue
-            except Exception as e:
-                print(f"[TCP] ✗ Error receiving from {client_ip}: {e}")
-                break
-    
+        client_sock, addr = server_sock.accept()
+    except (BlockingIOError, InterruptedError):
+        return
     except Exception as e:
-        print(f"[TCP] ✗ Error handling client {client_ip}: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    finally:
+        logger.error("[TCP] Error accepting connection: %s", e)
+        return
+
+    client_ip = addr[0]
+    # The selector map also holds the listening socket
+    if len(sel.get_map()) - 1 >= MAX_TCP_CLIENTS:
+        logger.warning("[TCP] Refusing %s: %d clients already connected", client_ip, MAX_TCP_CLIENTS)
+        client_sock.close()
+        return
+
+    try:
+        client_sock.setblocking(False)
+        # Not reliably inherited from the listener on every platform
+        client_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if _TCP_QUICKACK is not None:
+            client_sock.setsockopt(socket.IPPROTO_TCP, _TCP_QUICKACK, 1)
+        enable_tcp_keepalive(client_sock)
+
+        with clients_lock:
+            connected_clients[client_ip] = {
+                "socket": client_sock,
+                "connected_at": time.time()
+            }
+        # Per-connection state: the socket, peer IP and the partial-line receive buffer
+        conn = {"sock": client_sock, "ip": client_ip, "buf": bytearray(), "scan": 0}
+        sel.register(client_sock, selectors.EVENT_READ, conn)
+        logger.info("[TCP] Client connected: %s", client_ip)
+    except Exception as e:
+        logger.error("[TCP] Error registering connection from %s: %s", client_ip, e)
         try:
             client_sock.close()
         except:
             pass
+
+
+# Linux only. Drones write small messages without waiting for a reply, so a delayed
+# ACK from us can hold their next message behind Nagle; the kernel clears the flag
+# again on its own, hence it is re-armed after each read.
+_TCP_QUICKACK = getattr(socket, "TCP_QUICKACK", None)
+
+# Scratch receive buffer shared by all clients; only the tcp_server thread reads into it
+_tcp_recv_buf = bytearray(TCP_RECV_SIZE)
+_tcp_recv_view = memoryview(_tcp_recv_buf)
+
+
+def handle_tcp_readable(sel, conn):
+    """Drain a readable client socket and process every complete newline-delimited JSON message"""
+    client_sock = conn["sock"]
+    client_ip = conn["ip"]
+    buf = conn["buf"]
+
+    # Dead peers are detected by TCP keepalive (see enable_tcp_keepalive), which
+    # surfaces here as a recv() error
+    closed = False
+    while True:
+        try:
+            n = client_sock.recv_into(_tcp_recv_view)
+        except (BlockingIOError, InterruptedError):
+            break
+        except Exception as e:
+            logger.error("[TCP] ✗ Error receiving from %s: %s", client_ip, e)
+            closed = True
+            break
+
+        # Zero bytes means the remote closed the connection
+        if not n:
+            logger.info("[TCP] Client %s closed connection (received 0 bytes)", client_ip)
+            closed = True
+            break
+
+        buf += _tcp_recv_view[:n]
+        if n < TCP_RECV_SIZE:
+            break
+
+    if _TCP_QUICKACK is not None and not closed:
+        try:
+            client_sock.setsockopt(socket.IPPROTO_TCP, _TCP_QUICKACK, 1)
+        except OSError:
+            pass
+
+    # Process complete messages (separated by newlines); only finished lines are decoded.
+    # Bytes before conn["scan"] are known to hold no newline, and consumed lines are
+    # dropped from the buffer in one go at the end.
+    start = 0
+    scan = conn["scan"]
+    while True:
+        nl = buf.find(b'\n', scan)
+        if nl < 0:
+            break
+        line = bytes(buf[start:nl]).strip()
+        start = scan = nl + 1
+
+        if not line:
+            continue
+
+        try:
+            msg = orjson.loads(line)
+            process_tcp_message(msg, client_ip)
+        except orjson.JSONDecodeError as e:
+            logger.error("[TCP] Failed to parse JSON from %s: %s", client_ip, e)
+        except Exception as e:
+            logger.exception("[TCP] ✗ Error processing message from %s: %s", client_ip, e)
+
+    if start:
+        del buf[:start]
+    conn["scan"] = len(buf)
+
+    if closed:
+        close_tcp_client(sel, conn)
+
+
+def close_tcp_client(sel, conn):
+    """Unregister and close a client connection and drop the device it belonged to"""
+    client_sock = conn["sock"]
+    client_ip = conn["ip"]
+    try:
+        sel.unregister(client_sock)
+    except Exception:
+        pass
+    try:
+        client_sock.close()
+    except:
+        pass
+
+    with clients_lock:
+        if connected_clients.get(client_ip, {}).get("socket") is client_sock:
+            del connected_clients[client_ip]
+    with devices_lock:
+        dev_id = devices_by_ip.get(client_ip)
+        if dev_id:
+            _remove_device(dev_id)
+    close_robot_conn(client_ip)
+    if dev_id:
+        logger.info("[TCP] Removed device %s due to TCP disconnect", dev_id)
+    logger.info("[TCP] Client disconnected: %s", client_ip)
+
+
+def process_tcp_message(msg, client_ip):
+    """Handle one decoded message received from a drone/robot over TCP"""
+    now = time.time()
+    message_type = msg.get('message_type', 'UNKNOWN')
+    sender_id = msg.get('sender_id') or client_ip
+    logger.info("[TCP] Received from %s: %s", client_ip, message_type)
+
+    # If this is a QR code scan from drone, automatically assign robots
+    if message_type == "QR_SCAN":
+        content = msg.get('content', {})
+        qr_code = content.get('qr_code')
+        api_data = content.get('api_data', {})
+        issue_type = content.get('issue_type')
+        coordinates = content.get('coordinates', {})
+
+        # Store detected issue with actual coordinates from drone (skip duplicates)
+        if issue_type and coordinates:
+            issue_key = _issue_key(issue_type, coordinates)
+
+            with issues_lock:
+                if issue_key in detected_issues:
+                    logger.warning("[ISSUE] ⚠️ Duplicate issue ignored: %s at %s (already exists)", issue_type, coordinates)
+                else:
+                    _issues_changed()
+                    detected_issues[issue_key] = {
+                        "issue_type": issue_type,
+                        "coordinates": coordinates,
+                        "timestamp": now,
+                        "drone_id": sender_id,
+                        "api_data": api_data
+                    }
+                    logger.info("[ISSUE] ✓ Stored NEW issue: %s at coordinates %s", issue_type, coordinates)
+                    logger.info("[ISSUE] Total issues in system: %s", len(detected_issues))
+        else:
+            logger.error("[ISSUE] ✗ Missing issue_type or coordinates - issue_type=%s, coordinates=%s", issue_type, coordinates)
+
+        if issue_type:
+
+            logger.info("[DETECTION] QR code scanned by %s: %s at %s", sender_id, issue_type, coordinates)
+            # Decorative banner only when debugging; skipped formatting costs nothing otherwise
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("\n".join((
+                    DETECTION_BANNER_TOP,
+                    f"[DETECTION] ║ QR CODE SCANNED BY DRONE                                      ║",
+                    f"[DETECTION] ║ Issue Type: {issue_type.upper():<43} ║",
+                    f"[DETECTION] ║ QR Code: {qr_code:<53} ║",
+                    f"[DETECTION] ║ API Data: {str(api_data):<49} ║",
+                    f"[DETECTION] ║ Location: X={coordinates.get('x', 0)}, Y={coordinates.get('y', 0)}, Z={coordinates.get('z', 0):<20} ║",
+                    f"[DETECTION] ║ Sender: {sender_id:<52} ║",
+                    f"[DETECTION] ║ Time: {time.strftime('%Y-%m-%d %H:%M:%S'):<50} ║",
+                    DETECTION_BANNER_BOTTOM,
+                )))
+
+            try:
+                handle_issue_detection(issue_type, coordinates, api_data)
+            except Exception as e:
+                logger.exception("[TCP] ✗ Error in handle_issue_detection: %s", e)
+    elif message_type == "TASK_COMPLETED":
+        content = msg.get('content', {})
+        task_id = content.get('task_id') or msg.get('message_id')
+        issue_type = content.get('issue_type')
+        coordinates = content.get('coordinates', {})
+        status = content.get('status')
+        message = content.get('message')
+        stage = content.get('stage', 0)
+
+        freed = False
+        # Prefer freeing by matching task_id to avoid freeing multiple robots by IP
+        freed_ids = []
+        with devices_lock:
+            # Find robot with this task_id
+            target_robot_id = devices_by_task.get(task_id)
+            if target_robot_id and device_types_lc[target_robot_id] != "robot":
+                target_robot_id = None
+            # Fallbacks if not found: sender_id, then IP (single match)
+            candidates = []
+            if target_robot_id:
+                candidates = [target_robot_id]
+            elif sender_id in devices:
+                candidates = [sender_id]
+            else:
+                dev_id = devices_by_ip.get(client_ip)
+                dev = devices.get(dev_id) if dev_id else None
+                if dev and device_types_lc[dev_id] == "robot":
+                    candidates = [dev_id]
+
+            for dev_id in candidates:
+                dev = devices.get(dev_id)
+                if not dev:
+                    continue
+                _set_task(dev_id, dev, None)
+                dev["current_task"] = None
+                dev["status"] = "READY"
+                dev["updated_at"] = now
+                freed_ids.append(dev_id)
+
+        # Issue bookkeeping and dispatch happen outside devices_lock
+        for dev_id in freed_ids:
+            freed = True
+            logger.info("[TASK] ✓ Task completed by %s (status=%s, task_id=%s, stage=%s)", dev_id, status, task_id, stage)
+            logger.info("[TASK] ✓ Robot is now available for new assignments")
+
+            if issue_type and coordinates:
+                issue_key = _issue_key(issue_type, coordinates)
+
+                # Clean up assignment tracking for this robot
+                with assignments_lock:
+                    if issue_key in issue_assignments:
+                        if dev_id in issue_assignments[issue_key]:
+                            issue_assignments[issue_key].remove(dev_id)
+                            logger.info("[TASK] Removed %s from assignment tracking for %s", dev_id, issue_key)
+                        if not issue_assignments[issue_key]:
+                            del issue_assignments[issue_key]
+                            logger.info("[TASK] Cleaned up assignment tracking for completed issue %s", issue_key)
+
+                # Determine if multi-stage and enqueue next stage if needed
+                with issues_lock:
+                    progress = issue_progress.get(issue_key)
+                    required_robot_types = []
+                    if progress:
+                        required_robot_types = progress.get("required_robot_types") or []
+                    elif issue_type in ISSUE_LOCATIONS:
+                        info = ISSUE_LOCATIONS[issue_type]
+                        rrt = info.get("required_robot_types") or ([] if not info.get("required_robot_type") else [info.get("required_robot_type")])
+                        required_robot_types = rrt
+                    staged = bool(required_robot_types)
+                    if staged:
+                        issue_progress[issue_key] = {
+                            "required_robot_types": required_robot_types,
+                            "current_stage": stage
+                        }
+                next_stage = stage + 1
+                final_stage = not bool(required_robot_types) or next_stage >= len(required_robot_types)
+
+                if final_stage:
+                    with issues_lock:
+                        if issue_key in detected_issues:
+                            del detected_issues[issue_key]
+                            _issues_changed()
+                            logger.info("[ISSUE] Removed resolved issue: %s at %s", issue_type, coordinates)
+                        if issue_key in issue_progress:
+                            del issue_progress[issue_key]
+                            logger.info("[ISSUE] Cleared progress tracking for %s", issue_key)
+                    # Clear active issue when completely finished
+                    with active_issue_lock:
+                        if globals().get('current_active_issue') == issue_key:
+                            globals()['current_active_issue'] = None
+                            logger.info("[TASK] ✓ Issue %s fully completed. Cleared active issue. Ready for next issue.", issue_key)
+                else:
+                    logger.info("[TASK] Staged issue: enqueuing next stage %s for %s", next_stage, issue_key)
+                    enqueue_issue(
+                        issue_key,
+                        issue_type,
+                        coordinates,
+                        api_data={},
+                        robot_count=1,
+                        required_robot_type=required_robot_types[next_stage],
+                        required_robot_types=required_robot_types,
+                        stage=next_stage,
+                    )
+        # Let the dispatcher retry queued issues now that a robot freed up
+        if freed:
+            request_dispatch()
+
+        if not freed:
+            logger.warning("[TASK] ⚠ Received TASK_COMPLETED from unknown device %s / %s", sender_id, client_ip)
+
+        log_packet(
+            direction="in",
+            transport="TCP",
+            packet_type="STATUS",
+            message_type="TASK_COMPLETED",
+            sender_id=sender_id,
+            receiver_id="base_station",
+            payload=msg,
+            timestamp=now,
+        )
+
+    log_packet(
+        direction="in",
+        transport="TCP",
+        packet_type="MESSAGE",
+        message_type=message_type,
+        sender_id=sender_id,
+        receiver_id="base_station",
+        payload=msg,
+        timestamp=now,
+    )
+
+
+def update_device_position(device_id, device_ip, position, now):
+    """Apply a POSITION_UPDATE to the matching device (by device_id first, then by IP)"""
+    with devices_lock:
+        updated = False
+        # Try matching by device_id first, then by IP
+        if device_id and device_id in devices:
+            devices[device_id]["position"] = position
+            devices[device_id]["updated_at"] = now
+            _devices_changed()
+            if now - last_position_log[device_id] >= POSITION_LOG_INTERVAL:
+                logger.info("[POSITION] Updated %s position: %s", device_id, position)
+                last_position_log[device_id] = now
+            updated = True
+        else:
+            # Fallback to IP matching
+            dev_id = devices_by_ip.get(device_ip)
+            dev = devices.get(dev_id) if dev_id else None
+            if dev:
+                dev["position"] = position
+                dev["updated_at"] = now
+                _devices_changed()
+                if now - last_position_log[dev_id] >= POSITION_LOG_INTERVAL:
+                    logger.info("[POSITION] Updated %s position: %s", dev_id, position)
+                    last_position_log[dev_id] = now
+                updated = True
         
-        with clients_lock:
-            if client_ip in connected_clients:
-                del connected_clients[client_ip]
-        devices_to_remove = []
-        for dev_id, dev in devices.items():
-            if dev.get("ip") == client_ip:
-                devices_to_remove.append(dev_id)
-        for dev_id in devices_to_remove:
-            del devices[dev_id]
-            print(f"[TCP] Removed device {dev_id} due to TCP disconnect")
-        print(f"[TCP] Client disconnected: {client_ip}")
+        if not updated:
+            logger.warning("[POSITION] ⚠️ No device found for position update (device_id=%s, ip=%s)", device_id, device_ip)
+
+
+def handle_udp_datagram(data, addr):
+    """Process a single UDP datagram (discovery, heartbeat or position update)"""
+    now = time.time()
+
+    # Binary POSITION_UPDATE fast path; JSON datagrams always start with '{'
+    if data[0] == POSITION_UPDATE_TAG:
+        if len(data) != POSITION_UPDATE_STRUCT.size:
+            logger.warning("[POSITION] ⚠️ Malformed binary position update (%d bytes) from %s", len(data), addr[0])
+            return
+        _, raw_id, x, y, z = POSITION_UPDATE_STRUCT.unpack(data)
+        device_id = raw_id.rstrip(b'\0').decode('utf-8', 'replace')
+        update_device_position(device_id, addr[0], {"x": x, "y": y, "z": z}, now)
+        return
+
+    msg = orjson.loads(data)
+    device_id = msg.get('device_id')
+    device_ip = msg.get('sender_ip') or addr[0]
+    message_type = msg.get('message_type')
+
+    # Handle POSITION_UPDATE without logging
+    if message_type == "POSITION_UPDATE":
+        update_device_position(device_id, device_ip, msg.get('position'), now)
+        return  # Skip logging for position updates
+
+    log_packet(
+        direction="in",
+        transport="UDP",
+        packet_type="DISCOVERY" if message_type == "CONNECTION_REQUEST" else "STATUS",
+        message_type=message_type,
+        # Heartbeats carry no device_id; identify them by sender IP instead
+        sender_id=device_id or device_ip,
+        receiver_id="base_station",
+        payload=msg,
+        timestamp=now,
+    )
+
+    if message_type == "HEARTBEAT":
+        # Periodic from every device; only worth a console line when debugging
+        logger.debug("[UDP] %s from %s at %s", message_type, device_id, device_ip)
+    else:
+        logger.info("[UDP] %s from %s at %s", message_type, device_id, device_ip)
+
+    if message_type == "CONNECTION_REQUEST" and device_id and device_ip:
+        position = msg.get('position')
+        reply_tcp_port = msg.get('reply_tcp_port', TCP_ROBOT_PORT)
+        device_type = msg.get('device_type', 'unknown')
+        ack = connection_ack_signal(device_id, device_ip, now)
+        # Send ACK over TCP to client on the port they specified
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as tcp:
+                tcp.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                tcp.settimeout(2)
+                tcp.connect((device_ip, reply_tcp_port))
+                tcp.sendall(orjson.dumps(ack))
+            status = "CONNECTED"
+            log_packet(
+                direction="out",
+                transport="TCP",
+                packet_type="ACK",
+                message_type="CONNECTION_ACK",
+                sender_id="base_station",
+                receiver_id=device_id,
+                payload=ack,
+                timestamp=now,
+            )
+        except Exception as e:
+            status = f"ACK_FAIL: {e}"
+
+        # A re-registering device has restarted; drop any stale outbound connection
+        close_robot_conn(device_ip)
+
+        # Extract robot_type if provided
+        is_robot = str(device_type).lower() == "robot"
+        robot_type = msg.get('robot_type') if is_robot else None
+        
+        with devices_lock:
+            _add_device(device_id, {
+                "device_id": device_id,
+                "ip": device_ip,
+                "status": status,
+                "position": position,
+                "device_type": device_type,
+                "robot_type": robot_type,
+                "updated_at": now
+            })
+        
+        if robot_type:
+            logger.info("[UDP] Robot %s registered as %s", device_id, robot_type)
+
+        # If a robot just joined, let the dispatcher retry queued issues
+        if is_robot:
+            logger.info("[QUEUE] New robot %s joined. Waking dispatcher for pending issues...", device_id)
+            request_dispatch()
+
+    elif message_type == "HEARTBEAT":
+        # Update device based on sender_ip since heartbeat may not include device_id
+        updated = False
+        with devices_lock:
+            dev_id = devices_by_ip.get(device_ip)
+            dev = devices.get(dev_id) if dev_id else None
+            if dev:
+                dev["updated_at"] = now
+                dev["battery_health"] = msg.get('battery_health', 100)
+                _devices_changed()
+                updated = True
+        if updated:
+            logger.debug("[UDP] Updated %s heartbeat (battery: %s%%)", dev_id, msg.get('battery_health', 'N/A'))
 
 
 def udp_listener():
@@ -433,213 +908,276 @@ def udp_listener():
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
         sock.bind(("0.0.0.0", UDP_PORT))
-        print(f"[SERVER] UDP listener on port {UDP_PORT}")
-        
+        logger.info("[SERVER] UDP listener on port %s", UDP_PORT)
+
+        # Preallocated receive buffers; after a blocking read, drain whatever else
+        # is already queued without blocking so a burst costs one wakeup
+        bufs = [bytearray(BUFFER_SIZE) for _ in range(UDP_BATCH_SIZE)]
+        views = [memoryview(b) for b in bufs]
+        dontwait = getattr(socket, "MSG_DONTWAIT", 0)
+
         while True:
+            batch = []
             try:
-                data, addr = sock.recvfrom(BUFFER_SIZE)
-                msg = json.loads(data.decode('utf-8'))
-                device_id = msg.get('device_id')
-                device_ip = msg.get('sender_ip') or addr[0]
-                position = msg.get('position')
-                message_type = msg.get('message_type')
-                reply_tcp_port = msg.get('reply_tcp_port', TCP_ROBOT_PORT)
-                device_type = msg.get('device_type', 'unknown')
-
-                # Handle POSITION_UPDATE without logging
-                if message_type == "POSITION_UPDATE":
-                    with devices_lock:
-                        updated = False
-                        now = time.time()
-                        # Try matching by device_id first, then by IP
-                        if device_id and device_id in devices:
-                            devices[device_id]["position"] = position
-                            devices[device_id]["updated_at"] = now
-                            if now - last_position_log[device_id] >= POSITION_LOG_INTERVAL:
-                                print(f"[POSITION] Updated {device_id} position: {position}")
-                                last_position_log[device_id] = now
-                            updated = True
-                        else:
-                            # Fallback to IP matching
-                            for dev_id, dev in devices.items():
-                                if dev.get("ip") == device_ip:
-                                    dev["position"] = position
-                                    dev["updated_at"] = now
-                                    if now - last_position_log[dev_id] >= POSITION_LOG_INTERVAL:
-                                        print(f"[POSITION] Updated {dev_id} position: {position}")
-                                        last_position_log[dev_id] = now
-                                    updated = True
-                                    break
-                        
-                        if not updated:
-                            print(f"[POSITION] ⚠️ No device found for position update (device_id={device_id}, ip={device_ip})")
-                    continue  # Skip logging for position updates
-
-                log_packet(
-                    direction="in",
-                    transport="UDP",
-                    packet_type="DISCOVERY" if message_type == "CONNECTION_REQUEST" else "STATUS",
-                    message_type=message_type,
-                    sender_id=device_id,
-                    receiver_id="base_station",
-                    payload=msg,
-                )
-
-                print(f"[UDP] {message_type} from {device_id} at {device_ip}")
-
-                if message_type == "CONNECTION_REQUEST" and device_id and device_ip:
-                    ack = connection_ack_signal(device_id, device_ip)
-                    # Send ACK over TCP to client on the port they specified
-                    try:
-                        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as tcp:
-                            tcp.settimeout(2)
-                            tcp.connect((device_ip, reply_tcp_port))
-                            tcp.sendall(json.dumps(ack).encode('utf-8'))
-                        status = "CONNECTED"
-                        log_packet(
-                            direction="out",
-                            transport="TCP",
-                            packet_type="ACK",
-                            message_type="CONNECTION_ACK",
-                            sender_id="base_station",
-                            receiver_id=device_id,
-                            payload=ack,
-                        )
-                    except Exception as e:
-                        status = f"ACK_FAIL: {e}"
-
-                    # Extract robot_type if provided
-                    robot_type = msg.get('robot_type') if device_type.lower() == "robot" else None
-                    
-                    devices[device_id] = {
-                        "device_id": device_id,
-                        "ip": device_ip,
-                        "status": status,
-                        "position": position,
-                        "device_type": device_type,
-                        "robot_type": robot_type,
-                        "updated_at": time.time()
-                    }
-                    
-                    if robot_type:
-                        print(f"[UDP] Robot {device_id} registered as {robot_type}")
-
-                    # If a robot just joined, try to dispatch queued issues immediately
-                    if device_type.lower() == "robot":
-                        print(f"[QUEUE] New robot {device_id} joined. Attempting to dispatch pending issues...")
+                nbytes, addr = sock.recvfrom_into(bufs[0])
+                batch.append((bytes(views[0][:nbytes]), addr))
+                if dontwait:
+                    for i in range(1, UDP_BATCH_SIZE):
                         try:
-                            process_issue_queue()
-                        except Exception as e:
-                            print(f"[QUEUE] Error while processing queue on robot join: {e}")
-
-                elif message_type == "HEARTBEAT":
-                    # Update device based on sender_ip since heartbeat may not include device_id
-                    updated = False
-                    for dev_id, dev in devices.items():
-                        if dev.get("ip") == device_ip:
-                            dev["updated_at"] = time.time()
-                            dev["battery_health"] = msg.get('battery_health', 100)
-                            print(f"[UDP] Updated {dev_id} heartbeat (battery: {msg.get('battery_health', 'N/A')}%)")
-                            updated = True
+                            nbytes, addr = sock.recvfrom_into(bufs[i], 0, dontwait)
+                        except (BlockingIOError, InterruptedError):
                             break
-                    
-                    if updated:
-                        log_packet(
-                            direction="in",
-                            transport="UDP",
-                            packet_type="STATUS",
-                            message_type="HEARTBEAT",
-                            sender_id=device_id or device_ip,
-                            receiver_id="base_station",
-                            payload=msg,
-                        )
-
+                        batch.append((bytes(views[i][:nbytes]), addr))
             except Exception as e:
-                print(f"[UDP] Error processing message: {e}")
+                logger.error("[UDP] Receive error: %s", e)
+
+            for data, addr in batch:
+                try:
+                    handle_udp_datagram(data, addr)
+                except Exception as e:
+                    logger.error("[UDP] Error processing message: %s", e)
     
     except Exception as e:
-        print(f"[UDP] Listener error: {e}")
+        logger.error("[UDP] Listener error: %s", e)
+
+def _conn_is_alive(tcp):
+    """Check a cached connection for a peer close without consuming any data"""
+    try:
+        tcp.setblocking(False)
+        try:
+            return tcp.recv(1, socket.MSG_PEEK) != b""
+        finally:
+            tcp.settimeout(ROBOT_SOCKET_TIMEOUT)
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+
+
+class RobotSocketPool:
+    """
+    Idle TCP connections to drones/robots keyed by (ip, port). Sockets are handed out
+    LIFO so the most recently used one is reused first, checked for a peer close
+    before reuse, and closed by sweep() once idle longer than idle_timeout.
+    """
+
+    def __init__(self, maxsize=3, idle_timeout=30.0, connect_timeout=2.0):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self._idle = {}  # {(ip, port): deque([(sock, last_used), ...])}
+        self._lock = threading.Lock()
+
+    def acquire(self, ip, port):
+        """Return (sock, reused): a live pooled socket if there is one, else a new connection"""
+        key = (ip, port)
+        while True:
+            with self._lock:
+                conns = self._idle.get(key)
+                sock = conns.pop()[0] if conns else None
+            if sock is None:
+                break
+            if _conn_is_alive(sock):
+                return sock, True
+            self.discard(sock)
+
+        sock = socket.create_connection(key, timeout=self.connect_timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        enable_tcp_keepalive(sock)
+        return sock, False
+
+    def release(self, sock, ip, port):
+        """Return a healthy socket to the pool, or close it if the pool is full"""
+        with self._lock:
+            conns = self._idle.setdefault((ip, port), deque())
+            if len(conns) < self.maxsize:
+                conns.append((sock, time.monotonic()))
+                return
+        self.discard(sock)
+
+    def discard(self, sock):
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+    def close_host(self, ip):
+        """Close every idle socket to ip (device restarted or went away)"""
+        with self._lock:
+            keys = [key for key in self._idle if key[0] == ip]
+            closing = [entry for key in keys for entry in self._idle.pop(key)]
+        for sock, _ in closing:
+            self.discard(sock)
+
+    def sweep(self):
+        """Close sockets that have sat idle longer than idle_timeout"""
+        cutoff = time.monotonic() - self.idle_timeout
+        closing = []
+        with self._lock:
+            for key, conns in list(self._idle.items()):
+                # Oldest entries sit at the left end
+                while conns and conns[0][1] < cutoff:
+                    closing.append(conns.popleft())
+                if not conns:
+                    del self._idle[key]
+        for sock, _ in closing:
+            self.discard(sock)
+
+    def drain(self):
+        """Close every pooled socket (shutdown)"""
+        with self._lock:
+            closing = [entry for conns in self._idle.values() for entry in conns]
+            self._idle.clear()
+        for sock, _ in closing:
+            self.discard(sock)
+
+
+robot_pool = RobotSocketPool(
+    maxsize=ROBOT_POOL_MAX_IDLE,
+    idle_timeout=ROBOT_POOL_IDLE_TIMEOUT,
+    connect_timeout=ROBOT_SOCKET_TIMEOUT,
+)
+
+
+# Devices read one inbound connection until EOF, so a second concurrent connection
+# would sit unread in their accept backlog; sends to one IP take turns on the pooled socket
+robot_send_locks = {}  # {ip: Lock}
+
+
+def send_on_robot_conn(device_ip: str, data: bytes):
+    """
+    Send a newline-delimited frame to a device over a pooled TCP connection.
+    Sends to the same device are serialized so they share one connection.
+    A failed pooled socket is dropped and the send retried; raises the socket error
+    if a freshly dialed connection fails too, or TimeoutError if another send to the
+    device holds the connection for longer than one worst-case send.
+    """
+    send_lock = robot_send_locks.setdefault(device_ip, threading.Lock())
+    if not send_lock.acquire(timeout=ROBOT_SEND_WORST_CASE):
+        raise TimeoutError(f"another send to {device_ip} is still in progress")
+    try:
+        while True:
+            tcp, reused = robot_pool.acquire(device_ip, TCP_ROBOT_PORT)
+            try:
+                tcp.sendall(data)
+            except OSError:
+                robot_pool.discard(tcp)
+                if not reused:
+                    raise
+                continue
+            robot_pool.release(tcp, device_ip, TCP_ROBOT_PORT)
+            return
+    finally:
+        send_lock.release()
+
+
+def close_robot_conn(device_ip: str):
+    if device_ip:
+        robot_pool.close_host(device_ip)
+
+
+def housekeeping():
+    """Run the periodic maintenance jobs (log flush, idle socket sweep) on one thread"""
+    scheduler = sched.scheduler(time.monotonic, time.sleep)
+
+    def every(interval, job, name):
+        def run():
+            try:
+                job()
+            except Exception as e:
+                logger.error("[HOUSEKEEPING] %s error: %s", name, e)
+            scheduler.enter(interval, 1, run)
+        scheduler.enter(interval, 1, run)
+
+    every(NETWORK_LOG_FLUSH_SEC, flush_network_logs, "log flush")
+    every(ROBOT_POOL_SWEEP_SEC, robot_pool.sweep, "pool sweep")
+    scheduler.run()
+
 
 def forward_to_all(receiver_category: str, message_content: dict):
     sent_to = []
     timestamp = time.time()
+    # One broadcast, one message: encoded once and sent as-is to every recipient
+    forward_msg = {
+        "message_id": new_message_id(),
+        "timestamp": int(timestamp),
+        "message_type": "FORWARD_ALL",
+        "receiver_category": receiver_category,
+        "sender": "base_station",
+        "content": message_content
+    }
+    blob = orjson.dumps(forward_msg) + b'\n'
     
-    for dev_id, dev in devices.items():
-        device_category = dev.get("device_type", "unknown").lower()
-        
-        if device_category == receiver_category:
-            device_ip = dev.get("ip")
-            if device_ip:
-                try:
-                    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as tcp:
-                        tcp.settimeout(2)
-                        tcp.connect((device_ip, TCP_ROBOT_PORT))
-                        
-                        forward_msg = {
-                            "message_id": f"{int(timestamp * 1000000)}",
-                            "timestamp": int(timestamp),
-                            "message_type": "FORWARD_ALL",
-                            "receiver_category": receiver_category,
-                            "sender": "base_station",
-                            "content": message_content
-                        }
-                        tcp.sendall(json.dumps(forward_msg).encode('utf-8'))
-                        sent_to.append(dev_id)
-                        print(f"[FORWARD] Sent FORWARD_ALL to {dev_id} at {device_ip}")
-                        log_packet(
-                            direction="out",
-                            transport="TCP",
-                            packet_type="FORWARD",
-                            message_type="FORWARD_ALL",
-                            sender_id="base_station",
-                            receiver_id=dev_id,
-                            payload=forward_msg,
-                        )
-                except Exception as e:
-                    print(f"[FORWARD] Failed to send to {dev_id}: {e}")
+    with devices_lock:
+        targets = [(dev_id, devices[dev_id]["ip"]) for dev_id in devices_by_category.get(receiver_category, ())
+                   if devices[dev_id].get("ip")]
+
+    def send_one(target):
+        dev_id, device_ip = target
+        try:
+            send_on_robot_conn(device_ip, blob)
+        except Exception as e:
+            logger.error("[FORWARD] Failed to send to %s: %s", dev_id, e)
+            return False
+        logger.info("[FORWARD] Sent FORWARD_ALL to %s at %s", dev_id, device_ip)
+        log_packet(
+            direction="out",
+            transport="TCP",
+            packet_type="FORWARD",
+            message_type="FORWARD_ALL",
+            sender_id="base_station",
+            receiver_id=dev_id,
+            payload=forward_msg,
+            timestamp=timestamp,
+        )
+        return True
+
+    # Connects to unreachable devices overlap instead of adding up
+    for (dev_id, _), ok in zip(targets, forward_executor.map(send_one, targets)):
+        if ok:
+            sent_to.append(dev_id)
     
     return sent_to
 
 
 def forward_to_device(receiver_id: str, receiver_ip: str, message_content: dict):
     timestamp = time.time()
-    message_id = f"{int(timestamp * 1000000)}"
+    message_id = new_message_id()
     
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as tcp:
-            tcp.settimeout(2)
-            tcp.connect((receiver_ip, TCP_ROBOT_PORT))
-            
-            forward_msg = {
-                "message_id": message_id,
-                "timestamp": int(timestamp),
-                "message_type": "FORWARD_TO",
-                "receiver_id": receiver_id,
-                "sender": "base_station",
-                "content": message_content
-            }
-            tcp.sendall(json.dumps(forward_msg).encode('utf-8'))
-            print(f"[FORWARD] Sent FORWARD_TO message to {receiver_id} at {receiver_ip}")
-            log_packet(
-                direction="out",
-                transport="TCP",
-                packet_type="FORWARD",
-                message_type="FORWARD_TO",
-                sender_id="base_station",
-                receiver_id=receiver_id,
-                payload=forward_msg,
-            )
-            
-            # Update the robot's task_id to the message_id
-            for dev_id, dev in devices.items():
-                if dev_id == receiver_id or dev.get("ip") == receiver_ip:
-                    dev["task_id"] = message_id
-                    print(f"[FORWARD] Updated {dev_id} task_id to {message_id}")
-                    break
-            
-            return True, message_id
+        forward_msg = {
+            "message_id": message_id,
+            "timestamp": int(timestamp),
+            "message_type": "FORWARD_TO",
+            "receiver_id": receiver_id,
+            "sender": "base_station",
+            "content": message_content
+        }
+        send_on_robot_conn(receiver_ip, orjson.dumps(forward_msg) + b'\n')
+        logger.info("[FORWARD] Sent FORWARD_TO message to %s at %s", receiver_id, receiver_ip)
+        log_packet(
+            direction="out",
+            transport="TCP",
+            packet_type="FORWARD",
+            message_type="FORWARD_TO",
+            sender_id="base_station",
+            receiver_id=receiver_id,
+            payload=forward_msg,
+            timestamp=timestamp,
+        )
+        
+        # Update the robot's task_id to the message_id
+        with devices_lock:
+            dev_id = receiver_id if receiver_id in devices else devices_by_ip.get(receiver_ip)
+            dev = devices.get(dev_id) if dev_id else None
+            if dev:
+                _set_task(dev_id, dev, message_id)
+        if dev:
+            logger.info("[FORWARD] Updated %s task_id to %s", dev_id, message_id)
+        
+        return True, message_id
     except Exception as e:
-        print(f"[FORWARD] Failed to send to {receiver_id} at {receiver_ip}: {e}")
+        logger.error("[FORWARD] Failed to send to %s at %s: %s", receiver_id, receiver_ip, e)
         return False, None
 
 
@@ -648,13 +1186,9 @@ def find_available_robot():
     Find a robot that is not assigned to any task
     Returns: (robot_id, robot_ip) or (None, None) if no available robot
     """
-    for dev_id, dev in devices.items():
-        device_type = dev.get("device_type", "").lower()
-        if device_type == "robot":
-            # Check if robot doesn't have a task_id or task_id is None/empty
-            task_id = dev.get("task_id")
-            if not task_id:
-                return dev_id, dev.get("ip")
+    with devices_lock:
+        for dev_id in free_robots:
+            return dev_id, devices[dev_id].get("ip")
     
     return None, None
 
@@ -665,26 +1199,14 @@ def find_available_robots(count: int, required_type: str = None):
     Optionally filter by robot type (e.g., TYPE1, TYPE2)
     Returns: list of (robot_id, robot_ip) tuples, may be less than count if not enough robots
     """
-    available = []
-    total_robots = 0
     with devices_lock:
-        for dev_id, dev in devices.items():
-            if dev.get("device_type", "").lower() == "robot":
-                total_robots += 1
-                # Filter by robot type if specified
-                if required_type and dev.get("robot_type") != required_type:
-                    print(f"[FIND] Skipping {dev_id}: type {dev.get('robot_type')} != {required_type}")
-                    continue
-                
-                task_id = dev.get("task_id")
-                status = dev.get("status", "UNKNOWN")
-                if not task_id:
-                    available.append((dev_id, dev.get("ip")))
-                    if len(available) >= count:
-                        break
-                else:
-                    print(f"[FIND] Robot {dev_id} busy: task_id={task_id}, status={status}")
-    print(f"[FIND] Total robots: {total_robots}, Available: {len(available)}, Requested: {count}, Type: {required_type}")
+        # Only idle robots are visited; busy ones never enter free_robots
+        free_count = len(free_robots)
+        candidates = free_robots
+        if required_type:
+            candidates = (d for d in free_robots if devices[d].get("robot_type") == required_type)
+        available = [(dev_id, devices[dev_id].get("ip")) for dev_id in itertools.islice(candidates, count)]
+    logger.info("[FIND] Free robots: %s, Available: %s, Requested: %s, Type: %s", free_count, len(available), count, required_type)
     return available
 
 
@@ -694,75 +1216,71 @@ def send_movement_command(robot_id: str, robot_ip: str, coordinates: dict, issue
     Returns: (success, message_id)
     """
     timestamp = time.time()
-    message_id = f"{int(timestamp * 1000000)}"
+    message_id = new_message_id()
     
-    print(f"[MOVEMENT] Sending command to {robot_id} at {robot_ip}")
+    logger.info("[MOVEMENT] Sending command to %s at %s", robot_id, robot_ip)
     
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as tcp:
-            tcp.settimeout(2)
-            tcp.connect((robot_ip, TCP_ROBOT_PORT))
-            print(f"[MOVEMENT] ✓ Connected to {robot_ip}:{TCP_ROBOT_PORT}")
-            
-            movement_msg = {
-                "message_id": message_id,
-                "timestamp": int(timestamp),
-                "message_type": "MOVEMENT_COMMAND",
-                "receiver_id": robot_id,
-                "sender": "base_station",
-                "content": {
+        movement_msg = {
+            "message_id": message_id,
+            "timestamp": int(timestamp),
+            "message_type": "MOVEMENT_COMMAND",
+            "receiver_id": robot_id,
+            "sender": "base_station",
+            "content": {
+                "issue_type": issue_type,
+                "coordinates": coordinates,
+                "command": "move_to_location",
+                "stage": stage
+            }
+        }
+        
+        message_data = orjson.dumps(movement_msg) + b'\n'
+        send_on_robot_conn(robot_ip, message_data)
+        logger.info("[MOVEMENT] ✓ Message sent (%s bytes)", len(message_data))
+        
+        logger.info("[MOVEMENT] Sent movement command to %s at %s for issue %s at %s", robot_id, robot_ip, issue_type, coordinates)
+        log_packet(
+            direction="out",
+            transport="TCP",
+            packet_type="COMMAND",
+            message_type="MOVEMENT_COMMAND",
+            sender_id="base_station",
+            receiver_id=robot_id,
+            payload=movement_msg,
+            timestamp=timestamp,
+        )
+        
+        # Update ONLY the targeted robot's task state by ID (avoid IP collisions)
+        with devices_lock:
+            if robot_id in devices:
+                dev = devices[robot_id]
+                _set_task(robot_id, dev, message_id)
+                dev["status"] = "BUSY"
+                dev["current_task"] = {
                     "issue_type": issue_type,
                     "coordinates": coordinates,
-                    "command": "move_to_location",
-                    "stage": stage
+                    "assigned_at": time.time()
                 }
-            }
-            
-            message_json = json.dumps(movement_msg)
-            message_data = message_json.encode('utf-8') + b'\n'
-            tcp.sendall(message_data)
-            print(f"[MOVEMENT] ✓ Message sent ({len(message_data)} bytes)")
-            
-            print(f"[MOVEMENT] Sent movement command to {robot_id} at {robot_ip} for issue {issue_type} at {coordinates}")
-            log_packet(
-                direction="out",
-                transport="TCP",
-                packet_type="COMMAND",
-                message_type="MOVEMENT_COMMAND",
-                sender_id="base_station",
-                receiver_id=robot_id,
-                payload=movement_msg,
-            )
-            
-            # Update ONLY the targeted robot's task state by ID (avoid IP collisions)
-            with devices_lock:
-                if robot_id in devices:
-                    dev = devices[robot_id]
-                    dev["task_id"] = message_id
-                    dev["status"] = "BUSY"
-                    dev["current_task"] = {
-                        "issue_type": issue_type,
-                        "coordinates": coordinates,
-                        "assigned_at": time.time()
-                    }
-                    print(f"[MOVEMENT] Updated {robot_id} task_id to {message_id}")
-            
-            return True, message_id
+                logger.info("[MOVEMENT] Updated %s task_id to %s", robot_id, message_id)
+        
+        return True, message_id
     except socket.timeout:
-        print(f"[MOVEMENT] ✗ Timeout connecting to {robot_id} at {robot_ip}:{TCP_ROBOT_PORT}")
+        logger.error("[MOVEMENT] ✗ Timeout connecting to %s at %s:%s", robot_id, robot_ip, TCP_ROBOT_PORT)
         return False, None
     except ConnectionRefusedError:
-        print(f"[MOVEMENT] ✗ Connection refused by {robot_id} at {robot_ip}:{TCP_ROBOT_PORT}")
+        logger.error("[MOVEMENT] ✗ Connection refused by %s at %s:%s", robot_id, robot_ip, TCP_ROBOT_PORT)
         return False, None
     except Exception as e:
-        print(f"[MOVEMENT] ✗ Failed to send movement command to {robot_id} at {robot_ip}: {e}")
-        import traceback
-        traceback.print_exc()
+        # A robot that is down fails every dispatch pass; only dump the stack when debugging
+        logger.error("[MOVEMENT] ✗ Failed to send movement command to %s at %s: %s", robot_id, robot_ip, e,
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
         return False, None
 
 
-def enqueue_issue(issue_key: str, issue_type: str, coordinates: dict, api_data: dict, robot_count: int, required_robot_type: str = None, required_robot_types: list = None, stage: int = 0):
-    """Add issue to pending queue if not already queued."""
+def enqueue_issue(issue_key: tuple, issue_type: str, coordinates: dict, api_data: dict, robot_count: int, required_robot_type: str = None, required_robot_types: list = None, stage: int = 0):
+    """Add issue to pending queue if not already queued and wake the dispatcher."""
+    global dispatch_requested
     # Track staged issue progress for multi-stage flows
     if required_robot_types:
         with issues_lock:
@@ -770,11 +1288,11 @@ def enqueue_issue(issue_key: str, issue_type: str, coordinates: dict, api_data:
                 "required_robot_types": required_robot_types,
                 "current_stage": stage
             }
-    with pending_lock:
-        for item in pending_issues:
-            if item.get("issue_key") == issue_key:
-                print(f"[QUEUE] Issue already in queue: {issue_key}")
-                return
+    with pending_cv:
+        if issue_key in pending_keys:
+            logger.info("[QUEUE] Issue already in queue: %s", issue_key)
+            return
+        pending_keys.add(issue_key)
         pending_issues.append({
             "issue_key": issue_key,
             "issue_type": issue_type,
@@ -786,140 +1304,149 @@ def enqueue_issue(issue_key: str, issue_type: str, coordinates: dict, api_data:
             "stage": stage,
             "enqueued_at": time.time()
         })
-        print(f"[QUEUE] Enqueued issue {issue_key} (stage {stage}, requires {required_robot_type}). Queue size: {len(pending_issues)}")
+        logger.info("[QUEUE] Enqueued issue %s (stage %s, requires %s). Queue size: %s", issue_key, stage, required_robot_type, len(pending_issues))
+        dispatch_requested = True
+        pending_cv.notify()
 
 
 def process_issue_queue():
-    """Try to dispatch queued issues sequentially when robots become available."""
+    """Try to dispatch queued issues sequentially when robots become available (dispatcher thread only)."""
     global current_active_issue
     dispatcher_id = f"D{int(time.time() * 1000000) % 10000}"
-    # Ensure only one dispatcher runs at a time
-    if not dispatch_lock.acquire(blocking=False):
-        print(f"[QUEUE:{dispatcher_id}] ⚠️  Dispatcher already running, skipping this call")
-        return
+    logger.info("[QUEUE:%s] 🚀 Starting dispatch process...", dispatcher_id)
+    # Check if another issue is already active
+    with active_issue_lock:
+        if current_active_issue is not None:
+            logger.warning("[QUEUE:%s] ⚠️  Issue %s is currently active. Waiting for it to complete before processing next issue.", dispatcher_id, current_active_issue)
+            return
     
-    print(f"[QUEUE:{dispatcher_id}] 🚀 Starting dispatch process...")
-    try:
-        # Check if another issue is already active
-        with active_issue_lock:
-            if current_active_issue is not None:
-                print(f"[QUEUE:{dispatcher_id}] ⚠️  Issue {current_active_issue} is currently active. Waiting for it to complete before processing next issue.")
+    while True:
+        # Peek at the head; pending_keys guarantees it has no duplicates further back
+        with pending_cv:
+            if not pending_issues:
+                logger.info("[QUEUE:%s] Queue empty, exiting dispatcher", dispatcher_id)
                 return
+            issue = pending_issues[0]
         
-        while True:
-            # Atomically: get issue and remove any duplicates from queue
-            with pending_lock:
-                if not pending_issues:
-                    print(f"[QUEUE:{dispatcher_id}] Queue empty, exiting dispatcher")
-                    return
-                
-                # Get the first issue
-                issue = pending_issues[0]
-                current_issue_key = issue.get("issue_key")
-                
-                # Look ahead and remove any duplicate issues (same location/type)
-                duplicates_removed = 0
-                i = 1
-                while i < len(pending_issues):
-                    if pending_issues[i].get("issue_key") == current_issue_key:
-                        print(f"[QUEUE:{dispatcher_id}] ⚠️  Found duplicate of {current_issue_key}, removing from queue")
-                        pending_issues.remove(pending_issues[i])
-                        duplicates_removed += 1
-                    else:
-                        i += 1
-                
-                if duplicates_removed > 0:
-                    print(f"[QUEUE:{dispatcher_id}] Removed {duplicates_removed} duplicate(s)")
-            
-            issue_type = issue.get("issue_type")
-            coords = issue.get("coordinates", {})
-            api_data = issue.get("api_data", {})
-            robot_count = issue.get("robot_count", 1)
-            required_robot_type = issue.get("required_robot_type")
-            required_robot_types = issue.get("required_robot_types") or ([required_robot_type] if required_robot_type else [])
-            stage = issue.get("stage", 0)
-            issue_key = issue.get("issue_key")
-
-            # Determine required type for this stage
-            if required_robot_types:
-                if stage >= len(required_robot_types):
-                    print(f"[QUEUE:{dispatcher_id}] ⚠️ Stage index out of range for {issue_key}. Skipping.")
-                    with pending_lock:
-                        if pending_issues and pending_issues[0].get("issue_key") == issue_key:
-                            pending_issues.popleft()
-                    continue
-                required_robot_type = required_robot_types[stage]
-                robot_count = 1  # one robot per stage
+        issue_type = issue.get("issue_type")
+        coords = issue.get("coordinates", {})
+        api_data = issue.get("api_data", {})
+        robot_count = issue.get("robot_count", 1)
+        required_robot_type = issue.get("required_robot_type")
+        required_robot_types = issue.get("required_robot_types") or ([required_robot_type] if required_robot_type else [])
+        stage = issue.get("stage", 0)
+        issue_key = issue.get("issue_key")
+
+        # Determine required type for this stage
+        if required_robot_types:
+            if stage >= len(required_robot_types):
+                logger.warning("[QUEUE:%s] ⚠️ Stage index out of range for %s. Skipping.", dispatcher_id, issue_key)
+                with pending_cv:
+                    if pending_issues and pending_issues[0].get("issue_key") == issue_key:
+                        pending_issues.popleft()
+                        pending_keys.discard(issue_key)
+                continue
+            required_robot_type = required_robot_types[stage]
+            robot_count = 1  # one robot per stage
 
-            print(f"[QUEUE:{dispatcher_id}] Processing issue {issue_key} (stage {stage}), needs {robot_count} {required_robot_type} robot(s)")
-            print(f"[QUEUE:{dispatcher_id}] Searching for available {required_robot_type} robots...")
-            
-            # Get available robots of the required type
-            available = find_available_robots(robot_count, required_robot_type)
-            print(f"[QUEUE:{dispatcher_id}] Found {len(available)} available robot(s): {[r[0] for r in available]}")
+        logger.info("[QUEUE:%s] Processing issue %s (stage %s), needs %s %s robot(s)", dispatcher_id, issue_key, stage, robot_count, required_robot_type)
+        logger.info("[QUEUE:%s] Searching for available %s robots...", dispatcher_id, required_robot_type)
+        
+        # Get available robots of the required type
+        available = find_available_robots(robot_count, required_robot_type)
+        logger.info("[QUEUE:%s] Found %s available robot(s): %s", dispatcher_id, len(available), [r[0] for r in available])
+        
+        # Filter out robots already assigned to this issue
+        with assignments_lock:
+            already_assigned = issue_assignments.get(issue_key, [])
+            available = [(rid, rip) for rid, rip in available if rid not in already_assigned]
+            logger.info("[QUEUE:%s] After filtering, %s new robot(s) available: %s", dispatcher_id, len(available), [r[0] for r in available])
+        if not available:
+            logger.warning("[QUEUE:%s] ⚠️  No robots available for %s. Needed %s, found 0. Will retry later.", dispatcher_id, issue_key, robot_count)
+            return
+
+        # Require full team: do not partially assign multi-robot issues
+        if len(available) < robot_count:
+            logger.warning("[QUEUE:%s] ⚠️  Not enough robots for %s. Needed %s, have %s. Waiting.", dispatcher_id, issue_key, robot_count, len(available))
+            return
+
+        # Assign exactly the required robots
+        assign_count = robot_count
+        logger.info("[QUEUE:%s] Will assign %s robot(s) to %s", dispatcher_id, assign_count, issue_key)
+        
+        success_all = True
+        assigned_robots = []
+        
+        # Set this issue as active BEFORE assigning robots
+        with active_issue_lock:
+            globals()['current_active_issue'] = issue_key
+            logger.info("[QUEUE:%s] ✓ Activated issue: %s", dispatcher_id, issue_key)
+        
+        # Send to all robots in parallel so one slow robot doesn't delay the others
+        futures = []
+        for idx in range(assign_count):
+            robot_id, robot_ip = available[idx]
+            logger.info("[QUEUE:%s] → Sending command to robot %s/%s: %s", dispatcher_id, idx+1, assign_count, robot_id)
+            futures.append((robot_id, movement_executor.submit(send_movement_command, robot_id, robot_ip, coords, issue_type, stage)))
+        
+        # Track successful assignments immediately to prevent race conditions
+        for robot_id, future in futures:
+            try:
+                success, message_id = future.result(timeout=MOVEMENT_SEND_TIMEOUT)
+            except Exception as e:
+                logger.error("[QUEUE:%s] ✗ Send to %s did not complete: %s", dispatcher_id, robot_id, e)
+                success, message_id = False, None
             
-            # Filter out robots already assigned to this issue
-            with assignments_lock:
-                already_assigned = issue_assignments.get(issue_key, [])
-                available = [(rid, rip) for rid, rip in available if rid not in already_assigned]
-                print(f"[QUEUE:{dispatcher_id}] After filtering, {len(available)} new robot(s) available: {[r[0] for r in available]}")
-            if not available:
-                print(f"[QUEUE:{dispatcher_id}] ⚠️  No robots available for {issue_key}. Needed {robot_count}, found 0. Will retry later.")
-                return
+            if not success:
+                success_all = False
+                logger.error("[QUEUE:%s] ✗ Failed to send task to %s", dispatcher_id, robot_id)
+                # Clear active issue if assignment fails
+                with active_issue_lock:
+                    globals()['current_active_issue'] = None
+            else:
+                assigned_robots.append(robot_id)
+                # Immediately track this assignment
+                with assignments_lock:
+                    if issue_key not in issue_assignments:
+                        issue_assignments[issue_key] = []
+                    issue_assignments[issue_key].append(robot_id)
+                logger.info("[QUEUE:%s] ✓ Task sent to %s (msg_id=%s)", dispatcher_id, robot_id, message_id)
+        
+        logger.info("[QUEUE:%s] Assignment batch complete: %s robot(s) assigned", dispatcher_id, len(assigned_robots))
+        
+        # For staged issues (e.g., overheated_circuit), dequeue after stage assignment
+        if success_all and assigned_robots:
+            with pending_cv:
+                if pending_issues and pending_issues[0].get("issue_key") == issue_key:
+                    pending_issues.popleft()
+                    pending_keys.discard(issue_key)
+                    logger.info("[QUEUE:%s] ✓ Stage %s assigned for %s, dequeued. Queue size: %s", dispatcher_id, stage, issue_key, len(pending_issues))
+        else:
+            # Send failed, don't dequeue, retry later
+            logger.info("[QUEUE:%s] Send failed or no robots assigned, retrying later", dispatcher_id)
+            return
 
-            # Require full team: do not partially assign multi-robot issues
-            if len(available) < robot_count:
-                print(f"[QUEUE:{dispatcher_id}] ⚠️  Not enough robots for {issue_key}. Needed {robot_count}, have {len(available)}. Waiting.")
-                return
 
-            # Assign exactly the required robots
-            assign_count = robot_count
-            print(f"[QUEUE:{dispatcher_id}] Will assign {assign_count} robot(s) to {issue_key}")
-            
-            success_all = True
-            assigned_robots = []
-            
-            # Set this issue as active BEFORE assigning robots
-            with active_issue_lock:
-                globals()['current_active_issue'] = issue_key
-                print(f"[QUEUE:{dispatcher_id}] ✓ Activated issue: {issue_key}")
-            
-            # Assign robots and immediately track them to prevent race conditions
-            for idx in range(assign_count):
-                robot_id, robot_ip = available[idx]
-                print(f"[QUEUE:{dispatcher_id}] → Sending command to robot {idx+1}/{assign_count}: {robot_id}")
-                success, message_id = send_movement_command(robot_id, robot_ip, coords, issue_type, stage)
-                
-                if not success:
-                    success_all = False
-                    print(f"[QUEUE:{dispatcher_id}] ✗ Failed to send task to {robot_id}")
-                    # Clear active issue if assignment fails
-                    with active_issue_lock:
-                        globals()['current_active_issue'] = None
-                    break
-                else:
-                    assigned_robots.append(robot_id)
-                    # Immediately track this assignment
-                    with assignments_lock:
-                        if issue_key not in issue_assignments:
-                            issue_assignments[issue_key] = []
-                        issue_assignments[issue_key].append(robot_id)
-                    print(f"[QUEUE:{dispatcher_id}] ✓ Task sent to {robot_id} (msg_id={message_id})")
-            
-            print(f"[QUEUE:{dispatcher_id}] Assignment batch complete: {len(assigned_robots)} robot(s) assigned")
-            
-            # For staged issues (e.g., overheated_circuit), dequeue after stage assignment
-            if success_all and assigned_robots:
-                with pending_lock:
-                    if pending_issues and pending_issues[0].get("issue_key") == issue_key:
-                        pending_issues.popleft()
-                        print(f"[QUEUE:{dispatcher_id}] ✓ Stage {stage} assigned for {issue_key}, dequeued. Queue size: {len(pending_issues)}")
-            else:
-                # Send failed, don't dequeue, retry later
-                print(f"[QUEUE:{dispatcher_id}] Send failed or no robots assigned, retrying later")
-                return
-    finally:
-        dispatch_lock.release()
+def request_dispatch():
+    """Wake the dispatcher thread because robot availability changed."""
+    global dispatch_requested
+    with pending_cv:
+        dispatch_requested = True
+        pending_cv.notify()
+
+
+def issue_dispatcher():
+    """Single consumer of pending_issues: runs a dispatch pass each time it is woken."""
+    global dispatch_requested
+    while True:
+        with pending_cv:
+            while not (dispatch_requested and pending_issues):
+                pending_cv.wait()
+            dispatch_requested = False
+        try:
+            process_issue_queue()
+        except Exception as e:
+            logger.error("[QUEUE] ✗ Dispatcher error: %s", e)
 
 
 def handle_issue_detection(issue_type: str, coordinates: dict, api_data: dict = None):
@@ -931,7 +1458,7 @@ def handle_issue_detection(issue_type: str, coordinates: dict, api_data: dict =
     - tilted_antenna: 1 robot
     """
     if issue_type not in ISSUE_LOCATIONS:
-        print(f"[ASSIGNMENT] ✗ Unknown issue type: {issue_type}")
+        logger.error("[ASSIGNMENT] ✗ Unknown issue type: %s", issue_type)
         return False
     
     # Get robot count and type from ISSUE_LOCATIONS, but use drone-provided coordinates
@@ -939,65 +1466,91 @@ def handle_issue_detection(issue_type: str, coordinates: dict, api_data: dict =
     robot_count = issue_info["robot_count"]
     required_robot_type = issue_info.get("required_robot_type")
     required_robot_types = issue_info.get("required_robot_types") or ([] if not required_robot_type else [required_robot_type])
-    issue_key = f"{issue_type}_{coordinates.get('x', 0)}_{coordinates.get('y', 0)}_{coordinates.get('z', 0)}"
+    issue_key = _issue_key(issue_type, coordinates)
         # Use coordinates from drone (not from ISSUE_LOCATIONS)
 
     # If this issue is already active/queued/assigned, skip re-enqueueing
     with assignments_lock:
         already_assigned = issue_key in issue_assignments
-    with pending_lock:
-        already_queued = any(item.get("issue_key") == issue_key for item in pending_issues)
+    with pending_cv:
+        already_queued = issue_key in pending_keys
     with issues_lock:
         already_detected = issue_key in detected_issues
 
     if already_assigned or already_queued or already_detected:
-        print(f"[ASSIGNMENT] ⚠️ Issue already active or queued: {issue_key} (assigned={already_assigned}, queued={already_queued}, detected={already_detected})")
+        logger.warning("[ASSIGNMENT] ⚠️ Issue already active or queued: %s (assigned=%s, queued=%s, detected=%s)", issue_key, already_assigned, already_queued, already_detected)
         return False
     
-    print(f"\n[ASSIGNMENT] ╔════════════════════════════════════════════════════════════╗")
-    print(f"[ASSIGNMENT] ║ ROBOT ASSIGNMENT INITIATED                              ║")
-    print(f"[ASSIGNMENT] ║ Issue Type: {issue_type.upper():<43} ║")
-    if required_robot_types:
-        print(f"[ASSIGNMENT] ║ Stages: {required_robot_types}                                       ║")
-    else:
-        print(f"[ASSIGNMENT] ║ Required Robots: {robot_count} x {required_robot_type:<37} ║")
-    print(f"[ASSIGNMENT] ║ Drone-Detected Location: X={coordinates.get('x', 0)}, Y={coordinates.get('y', 0)}, Z={coordinates.get('z', 0):<15} ║")
-    if api_data:
-        print(f"[ASSIGNMENT] ║ API Data: {str(api_data):<49} ║")
-    print(f"[ASSIGNMENT] ╚════════════════════════════════════════════════════════════╝\n")
+    logger.info("[ASSIGNMENT] Robot assignment initiated: %s at %s", issue_type, coordinates)
+    if logger.isEnabledFor(logging.DEBUG):
+        lines = [
+            ASSIGNMENT_BANNER_TOP,
+            f"[ASSIGNMENT] ║ ROBOT ASSIGNMENT INITIATED                              ║",
+            f"[ASSIGNMENT] ║ Issue Type: {issue_type.upper():<43} ║",
+        ]
+        if required_robot_types:
+            lines.append(f"[ASSIGNMENT] ║ Stages: {required_robot_types}                                       ║")
+        else:
+            lines.append(f"[ASSIGNMENT] ║ Required Robots: {robot_count} x {required_robot_type:<37} ║")
+        lines.append(f"[ASSIGNMENT] ║ Drone-Detected Location: X={coordinates.get('x', 0)}, Y={coordinates.get('y', 0)}, Z={coordinates.get('z', 0):<15} ║")
+        if api_data:
+            lines.append(f"[ASSIGNMENT] ║ API Data: {str(api_data):<49} ║")
+        lines.append(ASSIGNMENT_BANNER_BOTTOM)
+        logger.debug("\n".join(lines))
     
-    # Always enqueue to preserve strict FIFO across issues, then dispatch
+    # Always enqueue to preserve strict FIFO across issues; the dispatcher thread picks it up
     enqueue_issue(issue_key, issue_type, coordinates, api_data or {}, robot_count, required_robot_type, required_robot_types, stage=0)
-    print(f"[ASSIGNMENT] Calling process_issue_queue to dispatch...")
-    process_issue_queue()
-    print(f"[ASSIGNMENT] ═════════════════════════════════════════════════════════════\n")
     return True
 
 
 def cleanup_stale_devices():
+    """
+    Drop devices that have not been heard from in DEVICE_TIMEOUT seconds.
+    Sleeps until the earliest deadline in expiry_heap; heartbeats and position
+    updates only touch updated_at, so a device found fresh when its entry comes
+    due is simply pushed back to updated_at + DEVICE_TIMEOUT.
+    """
     while True:
         try:
-            time.sleep(10)
+            with expiry_cv:
+                while True:
+                    if not expiry_heap:
+                        expiry_cv.wait()
+                        continue
+                    deadline, dev_id = expiry_heap[0]
+                    delay = deadline - time.time()
+                    if delay <= 0:
+                        heapq.heappop(expiry_heap)
+                        expiry_scheduled.discard(dev_id)
+                        break
+                    expiry_cv.wait(timeout=delay)
+
             current_time = time.time()
-            devices_to_remove = []
-            
-            for dev_id, dev in devices.items():
+            with devices_lock:
+                dev = devices.get(dev_id)
+                if not dev:
+                    continue
                 last_seen = dev.get("updated_at", 0)
-                if current_time - last_seen > 60:
-                    devices_to_remove.append(dev_id)
-            
-            for dev_id in devices_to_remove:
-                del devices[dev_id]
-                print(f"[CLEANUP] Removed {dev_id} due to heartbeat timeout")
+                if current_time - last_seen <= DEVICE_TIMEOUT:
+                    _schedule_expiry(dev_id, last_seen + DEVICE_TIMEOUT)
+                    continue
+                dev_ip = dev.get("ip")
+                _remove_device(dev_id)
+
+            close_robot_conn(dev_ip)
+            logger.info("[CLEANUP] Removed %s due to heartbeat timeout", dev_id)
         
         except Exception as e:
-            print(f"[CLEANUP] Error: {e}")
+            logger.error("[CLEANUP] Error: %s", e)
+            time.sleep(1)
 
 @app.route("/api/connections")
 def api_connections():
-    return jsonify({
+    with devices_lock:
+        snapshot = list(devices.values())
+    return fastjson({
         "success": True,
-        "devices": list(devices.values()),
+        "devices": snapshot,
         "timestamp": time.time()
     })
 
@@ -1010,31 +1563,28 @@ def api_forget_device():
     device_ip = data.get("device_ip")
 
     if not device_id and not device_ip:
-        return jsonify({"success": False, "error": "device_id or device_ip required"}), 400
+        return fastjson({"success": False, "error": "device_id or device_ip required"}), 400
 
     removed_entries = []
 
     with devices_lock:
         if device_id and device_id in devices:
-            dev = devices.pop(device_id)
+            dev = _remove_device(device_id)
             removed_entries.append((device_id, dev.get("ip")))
         else:
             # Support forgetting by normalized ID shown in frontend or by IP.
-            target_ids = []
-            for dev_id, dev in devices.items():
-                ip = dev.get("ip")
-                dtype = str(dev.get("device_type", "")).lower()
-                norm_id = f"DRONE_{ip.replace('.', '')}" if (dtype == "drone" and ip) else dev_id
-                if (device_id and norm_id == device_id) or (device_ip and ip == device_ip):
-                    target_ids.append(dev_id)
+            target_ids = [
+                dev_id for dev_id, dev in devices.items()
+                if (device_id and device_norm_ids[dev_id] == device_id) or (device_ip and dev.get("ip") == device_ip)
+            ]
 
             for target_id in target_ids:
-                dev = devices.pop(target_id, None)
+                dev = _remove_device(target_id)
                 if dev:
                     removed_entries.append((target_id, dev.get("ip")))
 
     if not removed_entries:
-        return jsonify({"success": False, "error": "Device not found"}), 404
+        return fastjson({"success": False, "error": "Device not found"}), 404
 
     # Clean up related tracking maps for forgotten devices.
     removed_ids = {entry[0] for entry in removed_entries}
@@ -1043,6 +1593,8 @@ def api_forget_device():
     with clients_lock:
         for ip in removed_ips:
             connected_clients.pop(ip, None)
+    for ip in removed_ips:
+        close_robot_conn(ip)
 
     with assignments_lock:
         for issue_key, assigned_list in list(issue_assignments.items()):
@@ -1052,67 +1604,81 @@ def api_forget_device():
             else:
                 issue_assignments.pop(issue_key, None)
 
-    print(f"[FORGET] Removed devices: {removed_entries}")
-    return jsonify({
+    logger.info("[FORGET] Removed devices: %s", removed_entries)
+    return fastjson({
         "success": True,
         "removed": [{"device_id": rid, "device_ip": rip} for rid, rip in removed_entries],
         "count": len(removed_entries),
         "timestamp": time.time(),
     })
 
+@dataclass
+class OverviewEntry:
+    """Frontend-shaped view of one device for /api/overview (orjson serializes it as an object)"""
+    # Spelled out instead of dataclass(slots=True) so the module still runs before Python 3.10
+    __slots__ = ("id", "original_id", "battery", "status", "last_seen", "position", "ip",
+                 "task_id", "task_issue_type", "is_busy", "busy")
+    id: str
+    original_id: str
+    battery: Optional[int]
+    status: Optional[str]
+    last_seen: Optional[float]
+    position: Optional[dict]
+    ip: Optional[str]
+    task_id: Optional[str]
+    task_issue_type: Optional[str]
+    is_busy: bool  # internal
+    busy: bool     # frontend convenience
+
+
+def _overview_entry(dev, norm_id):
+    task_id = dev.get("task_id")
+    # Expose issue_type instead of opaque IDs/colors
+    task_issue_type = (dev.get("current_task") or {}).get("issue_type") if task_id else None
+    busy = bool(task_id)
+    return OverviewEntry(
+        norm_id,
+        dev.get("device_id"),
+        dev.get("battery_health"),
+        dev.get("status"),
+        dev.get("updated_at"),
+        dev.get("position"),
+        dev.get("ip"),
+        task_id,
+        task_issue_type,
+        busy,
+        busy,
+    )
+
+
 @app.route("/api/overview",methods=["GET"])
 def api_overview():
     """Provide drones, robots, and tasks in a shape the frontend expects."""
-    drones = {}
-    robots = {}
-    for dev_id, dev in devices.items():
-        dtype = str(dev.get("device_type", "")).lower()
-        ip = dev.get("ip")
-        if dtype == "drone" and ip:
-            norm_id = f"DRONE_{ip.replace('.', '')}"
-        else:
-            norm_id = dev_id
-        
-        # Get task information
-        task_id = dev.get("task_id")
-        current_task = dev.get("current_task", {})
-        # Expose issue_type instead of opaque IDs/colors
-        task_issue_type = current_task.get("issue_type") if task_id else None
-        
-        entry = {
-            "id": norm_id,
-            "original_id": dev_id,
-            "battery": dev.get("battery_health"),
-            "status": dev.get("status"),
-            "last_seen": dev.get("updated_at"),
-            "position": dev.get("position"),
-            "ip": dev.get("ip"),
-            "task_id": task_id,
-            "task_issue_type": task_issue_type,
-            "is_busy": bool(task_id),  # internal
-            "busy": bool(task_id),     # frontend convenience
-        }
-        if dtype == "robot":
-            robots[norm_id] = entry
-        else:
-            drones[norm_id] = entry
+    return cached_json("overview", devices_version, _build_overview)
 
-    return jsonify({
+
+def _build_overview():
+    with devices_lock:
+        snapshot = [(dev, device_types_lc[dev_id], device_norm_ids[dev_id]) for dev_id, dev in devices.items()]
+    robots = {norm_id: _overview_entry(d, norm_id) for d, type_lc, norm_id in snapshot if type_lc == "robot"}
+    drones = {norm_id: _overview_entry(d, norm_id) for d, type_lc, norm_id in snapshot if type_lc != "robot"}
+
+    return {
         "success": True,
         "drones": drones,
         "robots": robots,
         "tasks": {},
         "timestamp": time.time(),
-    })
+    }
 
 
 @app.route("/api/network-logs")
 def api_network_logs():
-    with logs_lock:
-        packets = list(network_logs)
-    # newest first
-    packets.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
-    return jsonify({"packets": packets})
+    # newest first: log_packet appends in arrival order, so reversing is enough.
+    # Timestamps taken by callers before the append can trail a concurrent
+    # entry by a few ms; arrival order is what the log view should show anyway.
+    packets = network_logs_snapshot[::-1]
+    return fastjson({"packets": packets})
 
 
 @app.route("/api/messages")
@@ -1121,9 +1687,13 @@ def api_messages():
 
 @app.route("/api/clear-logs", methods=["POST"])
 def api_clear_logs():
+    global network_logs_snapshot
     with logs_lock:
+        # Entries still waiting for the flusher belong to the log being cleared
+        _drain_packet_queue()
         network_logs.clear()
-    return jsonify({"success": True, "message": "logs cleared"})
+        network_logs_snapshot = ()
+    return fastjson({"success": True, "message": "logs cleared"})
 
 
 @app.route("/api/reset-tasks", methods=["POST"])
@@ -1135,33 +1705,35 @@ def api_reset_tasks():
         detected_count = len(detected_issues)
         progress_count = len(issue_progress)
         detected_issues.clear()
+        _issues_changed()
         issue_progress.clear()
 
     with assignments_lock:
         assignment_count = len(issue_assignments)
         issue_assignments.clear()
 
-    with pending_lock:
+    with pending_cv:
         pending_count = len(pending_issues)
         pending_issues.clear()
+        pending_keys.clear()
 
     with active_issue_lock:
         current_active_issue = None
 
     with devices_lock:
-        for dev in devices.values():
-            if str(dev.get("device_type", "")).lower() == "robot":
-                dev["task_id"] = None
-                dev["current_task"] = None
-                if dev.get("status") == "BUSY":
-                    dev["status"] = "READY"
-
-    print(
-        f"[RESET] Cleared tasks: detected={detected_count}, progress={progress_count}, "
-        f"assignments={assignment_count}, pending={pending_count}"
+        for dev_id in devices_by_category.get("robot", ()):
+            dev = devices[dev_id]
+            _set_task(dev_id, dev, None)
+            dev["current_task"] = None
+            if dev.get("status") == "BUSY":
+                dev["status"] = "READY"
+
+    logger.info(
+        "[RESET] Cleared tasks: detected=%s, progress=%s, assignments=%s, pending=%s",
+        detected_count, progress_count, assignment_count, pending_count,
     )
 
-    return jsonify({
+    return fastjson({
         "success": True,
         "message": "Task tracking reset successfully",
         "cleared": {
@@ -1177,28 +1749,31 @@ def api_reset_tasks():
 @app.route("/api/current-issues", methods=["GET"])
 def api_current_issues():
     """Get all currently detected issues with their locations"""
+    return cached_json("current-issues", issues_version, _build_current_issues)
+
+
+def _build_current_issues():
     with issues_lock:
         issues = list(detected_issues.values())
     
-    print(f"[API] /api/current-issues called - returning {len(issues)} issues")
+    logger.info("[API] /api/current-issues built - returning %s issues", len(issues))
     if issues:
-        print(f"[API] Issues data: {issues}")
+        logger.debug("[API] Issues data: %s", issues)
     
-    return jsonify({
+    return {
         "success": True,
         "issues": issues,
         "count": len(issues),
         "timestamp": time.time()
-    })
+    }
 
 
 @app.route("/api/devices-positions", methods=["GET"])
 def api_devices_positions():
     """Get current positions of all devices"""
     with devices_lock:
-        positions = {}
-        for dev_id, dev in devices.items():
-            positions[dev_id] = {
+        positions = {
+            dev_id: {
                 "device_id": dev_id,
                 "device_type": dev.get("device_type", "unknown"),
                 "position": dev.get("position"),
@@ -1207,8 +1782,10 @@ def api_devices_positions():
                 "updated_at": dev.get("updated_at"),
                 "task_id": dev.get("task_id")
             }
+            for dev_id, dev in devices.items()
+        }
     
-    return jsonify({
+    return fastjson({
         "success": True,
         "devices": positions,
         "timestamp": time.time()
@@ -1229,11 +1806,11 @@ def api_send_broadcast():
     message_content = data.get("message", {})
     
     if not receiver_category:
-        return jsonify({"success": False, "error": "receiver_category required"}), 400
+        return fastjson({"success": False, "error": "receiver_category required"}), 400
     
     sent_to = forward_to_all(receiver_category, message_content)
     
-    return jsonify({
+    return fastjson({
         "success": True,
         "sent_to": sent_to,
         "count": len(sent_to),
@@ -1262,23 +1839,20 @@ def api_send_message():
     if not receiver_id:
         receiver_id, receiver_ip = find_available_robot()
         if not receiver_id:
-            return jsonify({"success": False, "error": "No available robot (all robots are assigned)"}), 404
+            return fastjson({"success": False, "error": "No available robot (all robots are assigned)"}), 404
     else:
         # Find device by ID
-        device = None
-        for dev_id, dev in devices.items():
-            if dev_id == receiver_id or dev.get("ip") == receiver_id:
-                device = dev
-                break
+        with devices_lock:
+            device = devices.get(receiver_id) or devices.get(devices_by_ip.get(receiver_id))
         
         if not device:
-            return jsonify({"success": False, "error": f"Device {receiver_id} not found"}), 404
+            return fastjson({"success": False, "error": f"Device {receiver_id} not found"}), 404
         
         receiver_ip = device.get("ip")
     
     success, message_id = forward_to_device(receiver_id, receiver_ip, message_content)
     
-    return jsonify({
+    return fastjson({
         "success": success,
         "receiver_id": receiver_id,
         "message_id": message_id,
@@ -1286,62 +1860,29 @@ def api_send_message():
     })
 
 
-@app.route("/api/rust_location", methods=["GET"])
-def api_rust_location():
-    """Get predefined rust location and trigger robot assignment"""
-    issue_type = "rust"
-    issue_info = ISSUE_LOCATIONS.get(issue_type)
-    
-    if not issue_info:
-        return jsonify({"success": False, "error": "Rust location not configured"}), 400
-    
-    try:
-        handle_issue_detection(issue_type, issue_info["coordinates"])
-        return jsonify({
-            "success": True,
-            "issue_type": issue_type,
-            "coordinates": issue_info["coordinates"],
-            "description": issue_info["description"],
-            "robots_assigned": issue_info["robot_count"]
-        })
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
-
-
-@app.route("/api/antenna_tilt_location", methods=["GET"])
-def api_antenna_tilt_location():
-    """Get predefined tilted antenna location and trigger robot assignment"""
-    issue_type = "tilted_antenna"
-    issue_info = ISSUE_LOCATIONS.get(issue_type)
-    
-    if not issue_info:
-        return jsonify({"success": False, "error": "Tilted antenna location not configured"}), 400
-    
-    try:
-        handle_issue_detection(issue_type, issue_info["coordinates"])
-        return jsonify({
-            "success": True,
-            "issue_type": issue_type,
-            "coordinates": issue_info["coordinates"],
-            "description": issue_info["description"],
-            "robots_assigned": issue_info["robot_count"]
-        })
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+# URL slug -> (ISSUE_LOCATIONS key, label used in errors)
+LOCATION_ROUTES = {
+    "rust": ("rust", "Rust"),
+    "antenna_tilt": ("tilted_antenna", "Tilted antenna"),
+    "circuit_overheat": ("overheated_circuit", "Overheated circuit"),
+}
 
 
-@app.route("/api/circuit_overheat_location", methods=["GET"])
-def api_circuit_overheat_location():
-    """Get predefined overheated circuit location and trigger robot assignment"""
-    issue_type = "overheated_circuit"
+@app.route("/api/<slug>_location", methods=["GET"])
+def api_issue_location(slug):
+    """Get a predefined issue location and trigger robot assignment"""
+    route = LOCATION_ROUTES.get(slug)
+    if not route:
+        return fastjson({"success": False, "error": "Unknown issue location"}), 404
+    issue_type, label = route
     issue_info = ISSUE_LOCATIONS.get(issue_type)
     
     if not issue_info:
-        return jsonify({"success": False, "error": "Overheated circuit location not configured"}), 400
+        return fastjson({"success": False, "error": f"{label} location not configured"}), 400
     
     try:
         handle_issue_detection(issue_type, issue_info["coordinates"])
-        return jsonify({
+        return fastjson({
             "success": True,
             "issue_type": issue_type,
             "coordinates": issue_info["coordinates"],
@@ -1349,7 +1890,7 @@ def api_circuit_overheat_location():
             "robots_assigned": issue_info["robot_count"]
         })
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return fastjson({"success": False, "error": str(e)}), 500
 
 
 @app.route("/api/command-logs", methods=["GET"])
@@ -1357,10 +1898,12 @@ def get_command_logs():
     """Return recent command logs for drone/robot control"""
     with command_logs_lock:
         # Return logs in reverse chronological order (newest first)
-        return jsonify({
-            "success": True,
-            "commands": list(reversed(command_logs))
-        })
+        commands = list(reversed(command_logs))
+    # Serialize outside the lock so log_command() isn't held up by the encode
+    return fastjson({
+        "success": True,
+        "commands": commands
+    })
 
 
 @app.route("/api/log-command", methods=["POST"])
@@ -1373,7 +1916,7 @@ def log_command():
     device_type = data.get("device_type", "drone")
     
     if not device_id or not command:
-        return jsonify({"success": False, "error": "Missing device_id or command"}), 400
+        return fastjson({"success": False, "error": "Missing device_id or command"}), 400
     
     log_entry = {
         "device_id": device_id,
@@ -1385,23 +1928,31 @@ def log_command():
     
     with command_logs_lock:
         command_logs.append(log_entry)
-        # Keep only the most recent commands
-        if len(command_logs) > MAX_COMMAND_LOGS:
-            del command_logs[:-MAX_COMMAND_LOGS]
     
-    print(f"[COMMAND LOG] {device_type.upper()} {device_id}: {command} from {BASE_STATION_IP}")
+    logger.info("[COMMAND LOG] %s %s: %s from %s", device_type.upper(), device_id, command, BASE_STATION_IP)
     
-    return jsonify({"success": True, "logged": log_entry})
+    return fastjson({"success": True, "logged": log_entry})
 
 
 if __name__ == "__main__":
-    print(f"\n[SERVER] Starting Network Server")
-    print(f"[SERVER] TCP Listen Port (for drones/robots): {TCP_LISTEN_PORT}")
-    print(f"[SERVER] TCP Robot Port (for commands): {TCP_ROBOT_PORT}")
-    print(f"[SERVER] UDP Port: {UDP_PORT}\n")
+    atexit.register(robot_pool.drain)
+
+    logger.info("[SERVER] Starting Network Server")
+    logger.info("[SERVER] TCP Listen Port (for drones/robots): %s", TCP_LISTEN_PORT)
+    logger.info("[SERVER] TCP Robot Port (for commands): %s", TCP_ROBOT_PORT)
+    logger.info("[SERVER] UDP Port: %s", UDP_PORT)
     
     threading.Thread(target=tcp_server, daemon=True).start()
     threading.Thread(target=udp_listener, daemon=True).start()
     threading.Thread(target=cleanup_stale_devices, daemon=True).start()
+    threading.Thread(target=issue_dispatcher, daemon=True).start()
+    threading.Thread(target=housekeeping, daemon=True).start()
     
-    app.run(host="0.0.0.0", port=5000, debug=False)
+    try:
+        from waitress import serve
+    except ImportError:
+        logger.warning("[SERVER] waitress not installed (pip install waitress); using the Flask dev server")
+        app.run(host="0.0.0.0", port=5000, debug=False, threaded=True)
+    else:
+        logger.info("[SERVER] HTTP API on port 5000 (waitress, %s threads)", HTTP_THREADS)
+        serve(app, host="0.0.0.0", port=5000, threads=HTTP_THREADS, connection_limit=200)
@@ -1,5 +1,6 @@
 from dronekit import connect, VehicleMode
 from pymavlink import mavutil
+import threading
 import time
 
 # -------------------------------
@@ -26,12 +27,31 @@ if cmds.count == 0:
 
 print(f"Mission with {cmds.count} waypoints found")
 
+def wait_until(attr_names, condition, waiting_msg, recheck=5):
+    """Block until condition() holds, waking whenever one of attr_names changes"""
+    changed = threading.Event()
+
+    def on_change(self, attr_name, value):
+        changed.set()
+
+    for name in attr_names:
+        vehicle.add_attribute_listener(name, on_change)
+    try:
+        while True:
+            changed.clear()
+            if condition():
+                return
+            print(waiting_msg)
+            changed.wait(timeout=recheck)
+    finally:
+        for name in attr_names:
+            vehicle.remove_attribute_listener(name, on_change)
+
 # -------------------------------
 # WAIT UNTIL ARMABLE
 # -------------------------------
-while not vehicle.is_armable:
-    print("Waiting for vehicle to initialise...")
-    time.sleep(1)
+# is_armable is derived from mode, GPS fix and EKF state, so wake on any of them
+wait_until(('mode', 'gps_0', 'ekf_ok'), lambda: vehicle.is_armable, "Waiting for vehicle to initialise...")
 
 # -------------------------------
 # ARM VEHICLE
@@ -40,9 +60,7 @@ print("Arming motors")
 vehicle.mode = VehicleMode("GUIDED")
 vehicle.armed = True
 
-while not vehicle.armed:
-    print("Waiting for arming...")
-    time.sleep(1)
+wait_until(('armed',), lambda: vehicle.armed, "Waiting for arming...")
 
 print("Vehicle armed")
 
@@ -66,24 +84,35 @@ time.sleep(1)
 # -------------------------------
 vehicle.mode = VehicleMode("AUTO")
 
-while vehicle.mode.name != "AUTO":
-    print("Waiting for AUTO mode...")
-    time.sleep(1)
+wait_until(('mode',), lambda: vehicle.mode.name == "AUTO", "Waiting for AUTO mode...")
 
 print("Mission started in AUTO mode")
 
 # -------------------------------
 # MONITOR MISSION PROGRESS
 # -------------------------------
-while True:
-    next_wp = vehicle.commands.next
-    print(f"Current Waypoint: {next_wp}")
+mission_done = threading.Event()
+last_wp = None
+
+# DroneKit only records MISSION_CURRENT in commands.next without raising an
+# attribute notification, so listen for the MAVLink message itself
+def on_mission_current(self, name, message):
+    global last_wp
+    if message.seq != last_wp:
+        last_wp = message.seq
+        print(f"Current Waypoint: {message.seq}")
+    if message.seq == cmds.count:
+        mission_done.set()
+
+vehicle.add_message_listener('MISSION_CURRENT', on_mission_current)
 
-    if next_wp == cmds.count:
-        print("Final waypoint reached")
-        break
+# The listener wakes us as soon as the last waypoint is reached; the timeout
+# keeps the old 2 s re-check of commands.next in case a message is missed
+while not mission_done.is_set() and vehicle.commands.next != cmds.count:
+    mission_done.wait(timeout=2)
 
-    time.sleep(2)
+vehicle.remove_message_listener('MISSION_CURRENT', on_mission_current)
+print("Final waypoint reached")
 
 # -------------------------------
 # MISSION COMPLETE
@@ -2,12 +2,18 @@ import socket
 import time
 import json
 import threading
+import functools
+import queue
+import selectors
+from collections import OrderedDict
 import logging
 import os
 import math
 import numpy as np
 import cv2
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import platform
 
 
@@ -16,6 +22,9 @@ TCP_ACK_PORT = 9999          # Port for receiving ACK from base station
 BASE_STATION_TCP_PORT = 9998  # Port for sending messages TO base station
 HEARTBEAT_INTERVAL_SEC = 60
 POSITION_UPDATE_INTERVAL_SEC = 1  # Update position every 1 second
+DETECT_FRAME_SIZE = (320, 240)  # Capture/detection resolution (width, height)
+SENT_ISSUES_MAX = 4096  # Most recent QR/location keys remembered for dedupe
+QR_SEND_BATCH_MAX = 32  # Most QR_SCAN messages reported in one write
 
 # Drone position (simulated - in real scenario would come from GPS/sensors)
 drone_position = {"x": 10.0, "y": 20.0, "z": 15.0}
@@ -45,12 +54,40 @@ LOCATION_LOOKUP = {
 }
 
 
+# Shared HTTP session for QR lookups: keeps the connection to the API host alive
+# between scans and lets urllib3 handle retries.
+HTTP_RETRY_DELAY_SEC = 1  # pause before retrying a failed QR lookup
+
+
+class _FixedDelayRetry(Retry):
+	"""Retry that always waits HTTP_RETRY_DELAY_SEC; urllib3's own backoff skips the first retry"""
+	def get_backoff_time(self):
+		return HTTP_RETRY_DELAY_SEC
+
+
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.headers.update({
+	'User-Agent': 'Mozilla/5.0 (Linux; Drone) DroneClient/1.0',
+	'Accept': 'application/json'
+})
+# Retry statuses that can clear up on their own: 404 while the issue is still being
+# registered, 408/429 on a busy API, and 5xx server errors
+HTTP_RETRY_STATUSES = (404, 408, 429, 500, 502, 503, 504)
+HTTP_SESSION.mount("http://", HTTPAdapter(
+	pool_connections=1,
+	pool_maxsize=4,
+	max_retries=_FixedDelayRetry(total=1, status_forcelist=HTTP_RETRY_STATUSES, raise_on_status=False),
+))
+HTTP_SESSION.mount("https://", HTTP_SESSION.get_adapter("http://"))
+
+
 logging.basicConfig(
 	level=logging.INFO,
 	format="[%(asctime)s] %(levelname)s: %(message)s",
 )
 
 
+@functools.lru_cache(maxsize=1)
 def get_local_ip() -> str:
 	try:
 		with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
@@ -62,6 +99,14 @@ def get_local_ip() -> str:
 sender_ip = get_local_ip()
 device_id = f"DRONE_{sender_ip.replace('.', '')}"
 
+# Only message_id, timestamp and battery_health change between heartbeats, so the
+# rest of the datagram is formatted once and the varying fields are spliced in
+HEARTBEAT_TEMPLATE = (
+	'{"message_id": "%d", "timestamp": %d, "message_type": "HEARTBEAT", '
+	'"receiver_category": "BASE_STATION", "battery_health": %d, "sender_ip": '
+	+ json.dumps(sender_ip) + "}"
+).encode("utf-8")
+
 # Persistent connection to base station for sending messages
 message_sender_socket = None
 message_sender_lock = threading.Lock()
@@ -108,19 +153,21 @@ def wait_for_tcp_ack(listen_port: int = TCP_ACK_PORT, timeout_sec: int = 60) ->
 
 	with conn:
 		logging.info("TCP connection from %s:%d", addr[0], addr[1])
-		chunks = []
+		# Read until the first newline (or EOF) straight into one buffer
+		buf = bytearray()
 		conn.settimeout(10)
-		while True:
+		while b"\n" not in buf:
 			try:
-				buf = conn.recv(4096)
-				if not buf:
+				data = conn.recv(4096)
+				if not data:
 					break
-				chunks.append(buf)
+				buf += data
 			except socket.timeout:
 				break
 
 		try:
-			payload = json.loads(b"".join(chunks).decode("utf-8"))
+			end = buf.find(b"\n")
+			payload = json.loads(buf if end == -1 else buf[:end])
 		except Exception as e:
 			logging.error("Invalid ACK payload: %s", e)
 			srv.close()
@@ -146,7 +193,11 @@ def wait_for_tcp_ack(listen_port: int = TCP_ACK_PORT, timeout_sec: int = 60) ->
 	srv.close()
 	return base_ip
 
+BATTERY_CAPACITY_PATH = "/sys/class/power_supply/BAT0/capacity"
+_battery_file = None
+
 def get_battery_health() -> int:
+	global _battery_file
 	val = os.getenv("DRONE_BATTERY")
 	if val is not None:
 		try:
@@ -155,57 +206,64 @@ def get_battery_health() -> int:
 		except ValueError:
 			pass
 	try:
-		with open("/sys/class/power_supply/BAT0/capacity", "r") as f:
-			val = f.read().strip()
-			if val:
-				v = int(val)
-				return max(0, min(100, v))
+		# Keep the sysfs file open and re-read it from the start on each poll
+		if _battery_file is None:
+			_battery_file = open(BATTERY_CAPACITY_PATH, "r")
+		_battery_file.seek(0)
+		val = _battery_file.read().strip()
+		if val:
+			v = int(val)
+			return max(0, min(100, v))
 	except Exception:
-		pass
+		if _battery_file is not None:
+			try:
+				_battery_file.close()
+			except Exception:
+				pass
+		_battery_file = None
 	return 100
 
-def send_heartbeat(base_station_ip: str, stop_event: threading.Event | None = None) -> None:
-	sender_ip = get_local_ip()
-	with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-		while True:
-			if stop_event and stop_event.is_set():
-				logging.info("Heartbeat stopped")
-				return
-			timestamp = time.time()
-			payload = {
-				"message_id": f"{int(timestamp * 1000000)}",
-				"timestamp": int(timestamp),
-				"message_type": "HEARTBEAT",
-				"receiver_category": "BASE_STATION",
-				"battery_health": get_battery_health(),
-				"sender_ip": sender_ip,
-			}
-			data = json.dumps(payload).encode("utf-8")
-			try:
-				sock.sendto(data, (base_station_ip, UDP_SERVER_PORT))
-				logging.info("Sent HEARTBEAT to %s:%d", base_station_ip, UDP_SERVER_PORT)
-			except OSError as e:
-				logging.error("Failed to send HEARTBEAT: %s", e)
-			time.sleep(HEARTBEAT_INTERVAL_SEC)
+def send_heartbeat_once(sock: socket.socket, base_station_ip: str) -> None:
+	timestamp = time.time()
+	data = HEARTBEAT_TEMPLATE % (int(timestamp * 1000000), int(timestamp), get_battery_health())
+	try:
+		sock.sendto(data, (base_station_ip, UDP_SERVER_PORT))
+		logging.info("Sent HEARTBEAT to %s:%d", base_station_ip, UDP_SERVER_PORT)
+	except OSError as e:
+		logging.error("Failed to send HEARTBEAT: %s", e)
 
 def send_message_to_base_station(base_station_ip: str, message_type: str, content: dict):
 	"""
 	Send a message to the base station via persistent TCP connection (newline-delimited JSON)
 	"""
+	return send_messages_to_base_station(base_station_ip, [(message_type, content)])
+
+
+def send_messages_to_base_station(base_station_ip: str, messages: list[tuple[str, dict]]) -> bool:
+	"""
+	Send several (message_type, content) messages to the base station in a single write.
+	Each message is its own newline-delimited JSON line, so the base station sees them
+	exactly as if they had been sent one by one.
+	"""
 	global message_sender_socket
 	
 	try:
 		timestamp = time.time()
-		msg = {
-			"message_id": f"{int(timestamp * 1000000)}",
-			"timestamp": int(timestamp),
-			"message_type": message_type,
-			"sender_id": device_id,
-			"sender_ip": sender_ip,
-			"content": content
-		}
+		message_id = int(timestamp * 1000000)
+		lines = []
+		for offset, (message_type, content) in enumerate(messages):
+			msg = {
+				"message_id": f"{message_id + offset}",
+				"timestamp": int(timestamp),
+				"message_type": message_type,
+				"sender_id": device_id,
+				"sender_ip": sender_ip,
+				"content": content
+			}
+			lines.append(json.dumps(msg).encode('utf-8'))
 		
-		message_data = json.dumps(msg).encode('utf-8') + b'\n'
+		message_data = b'\n'.join(lines) + b'\n'
+		message_type = ", ".join(sorted({message_type for message_type, _ in messages}))
 		
 		with message_sender_lock:
 			# Try with existing connection first, then retry with new connection if it fails
@@ -216,6 +274,9 @@ def send_message_to_base_station(base_station_ip: str, message_type: str, conten
 						message_sender_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 						message_sender_socket.settimeout(5)
 						message_sender_socket.connect((base_station_ip, BASE_STATION_TCP_PORT))
+						# Small newline-framed messages: don't let Nagle hold them back
+						message_sender_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+						message_sender_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
 						logging.info(f"[SEND] Connected to base station at {base_station_ip}:{BASE_STATION_TCP_PORT}")
 					except Exception as e:
 						logging.error(f"[SEND] Failed to connect: {e}")
@@ -226,9 +287,9 @@ def send_message_to_base_station(base_station_ip: str, message_type: str, conten
 				
 				try:
 					# Send JSON message with newline delimiter
-					logging.info(f"[SEND] Sending {len(message_data)} bytes: {message_type}")
+					logging.info(f"[SEND] Sending {len(message_data)} bytes: {len(messages)} x {message_type}")
 					message_sender_socket.sendall(message_data)
-					logging.info(f"[SEND] ✓ Successfully sent {message_type} message")
+					logging.info(f"[SEND] ✓ Successfully sent {len(messages)} {message_type} message(s)")
 					return True
 				except Exception as e:
 					logging.error(f"[SEND] ✗ Send failed (attempt {attempt + 1}/2): {e}")
@@ -246,15 +307,15 @@ def send_message_to_base_station(base_station_ip: str, message_type: str, conten
 			return False
 	
 	except Exception as e:
-		logging.error(f"[SEND] Error in send_message_to_base_station: {e}")
+		logging.error(f"[SEND] Error in send_messages_to_base_station: {e}")
 		return False
 
 
-def qr_detected(api_url: str, base_station_ip: str = None) -> str | None:
-	"""Handle QR code detection.
+def fetch_qr_issue(api_url: str) -> tuple[dict, str | None]:
+	"""Look up the issue behind a scanned QR code.
 	Accepts either a full API URL or a short alias (e.g., '1').
 	Resolves aliases via LOCATION_LOOKUP before fetching.
-	Returns the issue_type if fetched successfully so caller can dedupe."""
+	Returns the QR_SCAN content for the base station and the issue_type."""
 	raw_qr = (api_url or "").strip()
 
 	# Resolve short alias or textual key to API URL if present
@@ -274,100 +335,63 @@ def qr_detected(api_url: str, base_station_ip: str = None) -> str | None:
 
 	api_data: dict = {}
 	issue_type: str | None = None
-	max_retries = 2
-	retry_delay = 1  # seconds between retries
-	
-	for attempt in range(max_retries):
-		try:
-			# Set proper headers and follow redirects
-			headers = {
-				'User-Agent': 'Mozilla/5.0 (Linux; Drone) DroneClient/1.0',
-				'Accept': 'application/json'
-			}
-			logging.info(f"[QR] Fetching API (attempt {attempt + 1}/{max_retries}): {api_url_to_fetch}")
-			response = requests.get(api_url_to_fetch, timeout=15, headers=headers, allow_redirects=True)
-			response.raise_for_status()  # Raise exception for HTTP errors
-			
-			# Log response details for debugging
-			logging.debug(f"[QR] Response status: {response.status_code}")
-			logging.debug(f"[QR] Response headers: {dict(response.headers)}")
-			logging.debug(f"[QR] Response text: {response.text[:500]}")  # First 500 chars
-			
-			# Check if response is empty
-			if not response.text or not response.text.strip():
-				logging.warning("[QR] API returned empty response body")
-				api_data = {"error": "Empty response from API"}
-				issue_type = "empty_response"
-			else:
-				try:
-					api_data = response.json()
-					issue_type = api_data.get("issue_type", "unknown")
-					# Prefer issue coordinates from API if provided
-					api_coordinates = api_data.get("coordinates") if isinstance(api_data, dict) else None
-					logging.info(f"[QR] ✓ API data fetched: {api_data}")
-					print(f"\n[QR] Scanned API: {api_url_to_fetch}")
-					print(f"[QR] Data: {json.dumps(api_data, indent=2)}\n")
-					break  # Success, exit retry loop
-				except json.JSONDecodeError as je:
-					logging.error(f"[QR] Failed to parse JSON: {je}")
-					logging.error(f"[QR] Response was: {response.text[:200]}")
-					api_data = {"error": "Invalid JSON response", "raw_response": response.text[:200]}
-					issue_type = "invalid_json"
-					break  # No point retrying JSON parse errors
-			
-			break  # Success
-			
-		except requests.exceptions.HTTPError as he:
-			logging.warning(f"[QR] HTTP Error (attempt {attempt + 1}): {he.response.status_code}")
-			api_data = {"error": f"HTTP {he.response.status_code}: {he.response.reason}"}
-			issue_type = f"http_{he.response.status_code}"
-			if attempt < max_retries - 1:
-				logging.info(f"[QR] Retrying in {retry_delay}s...")
-				time.sleep(retry_delay)
-		except requests.exceptions.Timeout:
-			logging.warning(f"[QR] API request timed out (15 seconds) - attempt {attempt + 1}/{max_retries}")
-			api_data = {"error": "API request timed out"}
-			issue_type = "timeout"
-			if attempt < max_retries - 1:
-				logging.info(f"[QR] Retrying in {retry_delay}s...")
-				time.sleep(retry_delay)
-		except requests.exceptions.ConnectionError as ce:
-			logging.warning(f"[QR] Could not connect to API (attempt {attempt + 1}): {ce}")
-			api_data = {"error": "Could not connect to API"}
-			issue_type = "connection_error"
-			if attempt < max_retries - 1:
-				logging.info(f"[QR] Retrying in {retry_delay}s...")
-				time.sleep(retry_delay)
-		except Exception as e:
-			logging.warning(f"[QR] Unexpected error (attempt {attempt + 1}): {type(e).__name__}: {e}")
-			api_data = {"error": str(e)}
-			issue_type = "unknown_error"
-			if attempt < max_retries - 1:
-				logging.info(f"[QR] Retrying in {retry_delay}s...")
-				time.sleep(retry_delay)
-
-	# Send QR_SCAN message to base station even if issue_type is missing or error
-	if base_station_ip:
-		content = {
-			# Keep both original and resolved forms for observability
-			"qr_raw": raw_qr,
-			"qr_code": api_url_to_fetch,
-			"issue_type": issue_type,
-			# Use API-provided coordinates if available; fallback to drone position
-			"coordinates": api_data.get("coordinates") if isinstance(api_data, dict) and api_data.get("coordinates") else drone_position,
-			"api_data": api_data,
-			"message": f"QR {raw_qr} detected by {device_id}",
-			"timestamp": time.time()
-		}
-		success = send_message_to_base_station(base_station_ip, "QR_SCAN", content)
-		if success:
-			logging.info(f"[QR] ✓ Sent QR_SCAN to base station (issue_type={issue_type})")
+	try:
+		logging.info(f"[QR] Fetching API: {api_url_to_fetch}")
+		response = HTTP_SESSION.get(api_url_to_fetch, timeout=15, allow_redirects=True)
+		response.raise_for_status()  # Raise exception for HTTP errors
+		
+		# Log response details for debugging
+		logging.debug(f"[QR] Response status: {response.status_code}")
+		logging.debug(f"[QR] Response headers: {dict(response.headers)}")
+		logging.debug(f"[QR] Response text: {response.text[:500]}")  # First 500 chars
+		
+		# Check if response is empty
+		if not response.text or not response.text.strip():
+			logging.warning("[QR] API returned empty response body")
+			api_data = {"error": "Empty response from API"}
+			issue_type = "empty_response"
 		else:
-			logging.error(f"[QR] ✗ Failed to send QR_SCAN to base station")
-	else:
-		logging.warning("[QR] No base_station_ip provided; cannot send QR_SCAN")
-
-	return issue_type
+			try:
+				api_data = response.json()
+				issue_type = api_data.get("issue_type", "unknown")
+				logging.info(f"[QR] ✓ API data fetched: {api_data}")
+				print(f"\n[QR] Scanned API: {api_url_to_fetch}")
+				print(f"[QR] Data: {json.dumps(api_data, indent=2)}\n")
+			except json.JSONDecodeError as je:
+				logging.error(f"[QR] Failed to parse JSON: {je}")
+				logging.error(f"[QR] Response was: {response.text[:200]}")
+				api_data = {"error": "Invalid JSON response", "raw_response": response.text[:200]}
+				issue_type = "invalid_json"
+		
+	except requests.exceptions.HTTPError as he:
+		logging.warning(f"[QR] HTTP Error: {he.response.status_code}")
+		api_data = {"error": f"HTTP {he.response.status_code}: {he.response.reason}"}
+		issue_type = f"http_{he.response.status_code}"
+	except requests.exceptions.Timeout:
+		logging.warning("[QR] API request timed out (15 seconds)")
+		api_data = {"error": "API request timed out"}
+		issue_type = "timeout"
+	except requests.exceptions.ConnectionError as ce:
+		logging.warning(f"[QR] Could not connect to API: {ce}")
+		api_data = {"error": "Could not connect to API"}
+		issue_type = "connection_error"
+	except Exception as e:
+		logging.warning(f"[QR] Unexpected error: {type(e).__name__}: {e}")
+		api_data = {"error": str(e)}
+		issue_type = "unknown_error"
+
+	content = {
+		# Keep both original and resolved forms for observability
+		"qr_raw": raw_qr,
+		"qr_code": api_url_to_fetch,
+		"issue_type": issue_type,
+		# Use API-provided coordinates if available; fallback to drone position
+		"coordinates": api_data.get("coordinates") if isinstance(api_data, dict) and api_data.get("coordinates") else drone_position,
+		"api_data": api_data,
+		"message": f"QR {raw_qr} detected by {device_id}",
+		"timestamp": time.time()
+	}
+	return content, issue_type
 
 
 def handle_forward_message(msg: dict):
@@ -385,56 +409,217 @@ def handle_forward_message(msg: dict):
 		logging.warning(f"[MESSAGE] Unknown message type: {message_type}")
 
 
-def receive_messages(stop_event: threading.Event) -> None:
-	"""Listen for incoming messages from base station on TCP port 9999"""
+def _dispatch_message(msg: dict) -> None:
+	message_type = msg.get('message_type')
+	if message_type in ["FORWARD_ALL", "FORWARD_TO"]:
+		handle_forward_message(msg)
+	else:
+		logging.info(f"[MESSAGE] Received: {message_type}")
+
+
+def _close_message_conn(sel: selectors.BaseSelector, conn: socket.socket) -> None:
 	try:
-		server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-		server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-		server_sock.bind(("0.0.0.0", TCP_ACK_PORT))
-		server_sock.listen(5)
-		logging.info(f"[MESSAGE] Listening for messages on port {TCP_ACK_PORT}")
+		sel.unregister(conn)
+	except Exception:
+		pass
+	try:
+		conn.close()
+	except Exception:
+		pass
+
+
+def _read_message_conn(sel: selectors.BaseSelector, conn: socket.socket, buf: bytearray) -> None:
+	try:
+		data = conn.recv(4096)
+	except (BlockingIOError, InterruptedError):
+		return
+	except OSError as e:
+		logging.error(f"[MESSAGE] Error receiving message: {e}")
+		_close_message_conn(sel, conn)
+		return
+	if not data:
+		_close_message_conn(sel, conn)
+		return
+	buf += data
+	# Messages are newline-delimited JSON; keep any partial tail for the next read
+	while (idx := buf.find(b'\n')) != -1:
+		line = bytes(buf[:idx])
+		del buf[:idx + 1]
+		if not line.strip():
+			continue
+		try:
+			_dispatch_message(json.loads(line))
+		except Exception as e:
+			logging.error(f"[MESSAGE] Error processing message: {e}")
+
+
+def _accept_message_conn(sel: selectors.BaseSelector, server_sock: socket.socket) -> None:
+	try:
+		client_sock, addr = server_sock.accept()
+	except (BlockingIOError, InterruptedError):
+		return
+	logging.info(f"[MESSAGE] Incoming connection from {addr[0]}")
+	client_sock.setblocking(False)
+	sel.register(client_sock, selectors.EVENT_READ, bytearray())
+
+
+def receive_messages(stop_event: threading.Event, base_station_ip: str = None) -> None:
+	"""Listen for incoming messages from base station on TCP port 9999
+
+	The listen socket and every accepted connection share one selector, so a
+	single wakeup services all readable sockets and connections can stay open
+	across messages. When base_station_ip is given the same loop also sends the
+	periodic HEARTBEAT, using the select timeout as its timer."""
+	sel = selectors.DefaultSelector()
+	hb_sock = None
+	try:
+		if base_station_ip:
+			hb_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 		
-		server_sock.settimeout(1)  # Non-blocking with timeout
+		server_sock = None
+		try:
+			server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+			server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+			server_sock.bind(("0.0.0.0", TCP_ACK_PORT))
+			server_sock.listen(5)
+			server_sock.setblocking(False)
+			sel.register(server_sock, selectors.EVENT_READ, None)
+			logging.info(f"[MESSAGE] Listening for messages on port {TCP_ACK_PORT}")
+		except OSError as e:
+			# Keep heartbeating even if the message port is unavailable
+			logging.error(f"[MESSAGE] Could not listen on port {TCP_ACK_PORT}: {e}")
+			if server_sock is not None:
+				server_sock.close()
 		
+		next_heartbeat = time.monotonic()
 		while not stop_event.is_set():
-			try:
-				client_sock, addr = server_sock.accept()
-				client_ip = addr[0]
-				logging.info(f"[MESSAGE] Incoming connection from {client_ip}")
-				
-				# Handle the incoming message
-				try:
-					data = client_sock.recv(4096)
-					if data:
-						msg = json.loads(data.decode('utf-8'))
-						message_type = msg.get('message_type')
-						
-						if message_type in ["FORWARD_ALL", "FORWARD_TO"]:
-							handle_forward_message(msg)
-						else:
-							logging.info(f"[MESSAGE] Received: {message_type}")
-				except Exception as e:
-					logging.error(f"[MESSAGE] Error processing message: {e}")
-				finally:
-					client_sock.close()
+			timeout = 1
+			if hb_sock is not None:
+				now = time.monotonic()
+				if now >= next_heartbeat:
+					send_heartbeat_once(hb_sock, base_station_ip)
+					next_heartbeat = now + HEARTBEAT_INTERVAL_SEC
+				timeout = min(timeout, max(0, next_heartbeat - now))
 			
-			except socket.timeout:
+			if not sel.get_map():
+				stop_event.wait(timeout)
 				continue
-			except Exception as e:
-				logging.error(f"[MESSAGE] Error accepting connection: {e}")
-				break
+			
+			for key, _ in sel.select(timeout=timeout):
+				try:
+					if key.data is None:
+						_accept_message_conn(sel, key.fileobj)
+					else:
+						_read_message_conn(sel, key.fileobj, key.data)
+				except Exception as e:
+					logging.error(f"[MESSAGE] Error handling connection: {e}")
 		
-		server_sock.close()
 		logging.info("[MESSAGE] Message server closed")
+		if hb_sock is not None:
+			logging.info("Heartbeat stopped")
 	
 	except Exception as e:
 		logging.error(f"[MESSAGE] Error in receive_messages: {e}")
+	finally:
+		for key in list(sel.get_map().values()):
+			try:
+				key.fileobj.close()
+			except Exception:
+				pass
+		sel.close()
+		if hb_sock is not None:
+			hb_sock.close()
+
+
+def _capture_frames(cap, frame_queue: queue.Queue, pipeline_stop: threading.Event) -> None:
+	"""Capture stage: read camera frames and hand them to the detect stage"""
+	while not pipeline_stop.is_set():
+		ret, frame = cap.read()
+		if not ret:
+			logging.warning("[VIDEO] Failed to read frame from camera")
+			break
+		# Block while the detector is busy (back-pressure), but keep honoring stop
+		while not pipeline_stop.is_set():
+			try:
+				frame_queue.put(frame, timeout=0.5)
+				break
+			except queue.Full:
+				continue
+	try:
+		frame_queue.put_nowait(None)
+	except queue.Full:
+		pass
+
+
+def _lookup_qr_scans(qr_queue: queue.Queue, report_queue: queue.Queue, sent_issues: OrderedDict,
+		sent_lock: threading.Lock, pipeline_stop: threading.Event) -> None:
+	"""Lookup stage: fetch the issue behind each QR sighting and hand the report on"""
+	while not pipeline_stop.is_set():
+		try:
+			qr_data, issue_key = qr_queue.get(timeout=0.5)
+		except queue.Empty:
+			continue
+		content, issue_type = fetch_qr_issue(qr_data)
+		resolved = "error" not in content["api_data"]
+		report_queue.put((content, resolved))
+		if issue_type:
+			logging.info(f"[VIDEO] ✓ Stored issue key '{issue_key}' in sent list")
+		else:
+			# Release the claim so the next sighting is retried
+			with sent_lock:
+				sent_issues.pop(issue_key, None)
+			logging.debug(f"[VIDEO] API {qr_data} did not return issue_type; not storing")
+
+
+def _report_qr_scans(report_queue: queue.Queue, pipeline_stop: threading.Event, base_station_ip: str = None) -> None:
+	"""Report stage: send finished QR_SCAN reports to the base station
+
+	Each report is sent as soon as its lookup returns; only reports that are already
+	waiting (e.g. while a previous send reconnects) are coalesced into one write.
+	Failed lookups are still reported, as they always were, but each in its own write
+	so error payloads never ride along with real detections."""
+	while not pipeline_stop.is_set():
+		try:
+			reports = [report_queue.get(timeout=0.5)]
+		except queue.Empty:
+			continue
+		while len(reports) < QR_SEND_BATCH_MAX:
+			try:
+				reports.append(report_queue.get_nowait())
+			except queue.Empty:
+				break
+		
+		if not base_station_ip:
+			logging.warning("[QR] No base_station_ip provided; cannot send QR_SCAN")
+			continue
+		
+		resolved = [("QR_SCAN", content) for content, ok in reports if ok]
+		batches = [resolved] if resolved else []
+		batches += [[("QR_SCAN", content)] for content, ok in reports if not ok]
+		for messages in batches:
+			if send_messages_to_base_station(base_station_ip, messages):
+				logging.info(f"[QR] ✓ Sent {len(messages)} QR_SCAN message(s) to base station")
+			else:
+				logging.error(f"[QR] ✗ Failed to send {len(messages)} QR_SCAN message(s) to base station")
 
 
 def start_video_detection(stop_event: threading.Event, base_station_ip: str = None) -> None:
-	"""Detect and decode QR codes using OpenCV (works on Windows, Mac, Linux with default camera)"""
+	"""Detect and decode QR codes using OpenCV (works on Windows, Mac, Linux with default camera)
+
+	Runs as a pipeline so the camera keeps capturing while a QR lookup waits on
+	HTTP: capture thread -> detect (this thread) -> lookup thread -> report thread.
+	Frames and sightings pass through small bounded queues; finished reports are
+	never dropped, so their queue is unbounded (it only grows as fast as lookups finish)."""
 	cap = None
-	sent_issues = set()  # Track which issues have already been sent to base station
+	capture_thread = None
+	lookup_thread = None
+	report_thread = None
+	pipeline_stop = threading.Event()
+	frame_queue = queue.Queue(maxsize=2)
+	qr_queue = queue.Queue(maxsize=2)
+	report_queue = queue.Queue()
+	sent_issues = OrderedDict()  # LRU of issues sent (or in flight) to base station
+	sent_lock = threading.Lock()
 	try:
 		# Setup the Camera - use default camera (index 0)
 		logging.info("[VIDEO] Initializing default camera for QR code detection...")
@@ -444,9 +629,9 @@ def start_video_detection(stop_event: threading.Event, base_station_ip: str = No
 			logging.error("[VIDEO] ✗ Failed to open camera. Check if camera is connected and not in use.")
 			return
 		
-		# Set camera properties for better performance
-		cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-		cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+		# Capture directly at detection resolution so frames need no resize
+		cap.set(cv2.CAP_PROP_FRAME_WIDTH, DETECT_FRAME_SIZE[0])
+		cap.set(cv2.CAP_PROP_FRAME_HEIGHT, DETECT_FRAME_SIZE[1])
 		cap.set(cv2.CAP_PROP_FPS, 30)
 		
 		# Initialize OpenCV QR Code Detector
@@ -456,38 +641,63 @@ def start_video_detection(stop_event: threading.Event, base_station_ip: str = No
 		time.sleep(2)
 		logging.info(f"[VIDEO] ✓ Camera initialized on {platform.system()}, starting QR code detection")
 		
+		capture_thread = threading.Thread(
+			target=_capture_frames, args=(cap, frame_queue, pipeline_stop),
+			name="qr-capture", daemon=True
+		)
+		lookup_thread = threading.Thread(
+			target=_lookup_qr_scans, args=(qr_queue, report_queue, sent_issues, sent_lock, pipeline_stop),
+			name="qr-lookup", daemon=True
+		)
+		report_thread = threading.Thread(
+			target=_report_qr_scans, args=(report_queue, pipeline_stop, base_station_ip),
+			name="qr-report", daemon=True
+		)
+		capture_thread.start()
+		lookup_thread.start()
+		report_thread.start()
+		
 		frame_count = 0
 		while not stop_event.is_set():
 			try:
-				ret, frame = cap.read()
-				
-				if not ret:
-					logging.warning("[VIDEO] Failed to read frame from camera")
+				try:
+					frame = frame_queue.get(timeout=1)
+				except queue.Empty:
+					continue
+				if frame is None:
 					break
 				
-				# Resize for faster processing
-				small_frame = cv2.resize(frame, (320, 240))
-				
-				# Convert BGR to GRAY (OpenCV uses BGR format)
-				gray = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY)
+				# Only resize if the camera ignored the requested capture size
+				if frame.shape[1] != DETECT_FRAME_SIZE[0] or frame.shape[0] != DETECT_FRAME_SIZE[1]:
+					frame = cv2.resize(frame, DETECT_FRAME_SIZE)
 				
-				# Detect and decode QR code
-				qr_data, bbox, _ = detector.detectAndDecode(gray)
+				# Detect and decode QR code (the detector converts to grayscale itself)
+				qr_data, bbox, _ = detector.detectAndDecode(frame)
 				
 				# If QR data is found, treat it as an API URL to fetch issue data
 				if qr_data:
 					# Create location-based key to prevent duplicate detections at same location
-					issue_key = f"{qr_data}_{drone_position['x']}_{drone_position['y']}_{drone_position['z']}"
+					issue_key = (qr_data, drone_position['x'], drone_position['y'], drone_position['z'])
+					
+					with sent_lock:
+						already_sent = issue_key in sent_issues
+						if already_sent:
+							sent_issues.move_to_end(issue_key)
+						else:
+							# Claim the key before handing off so later frames don't queue it again
+							sent_issues[issue_key] = None
+							if len(sent_issues) > SENT_ISSUES_MAX:
+								sent_issues.popitem(last=False)
 					
-					if issue_key in sent_issues:
+					if already_sent:
 						logging.debug(f"[VIDEO] Issue at location ({drone_position['x']}, {drone_position['y']}, {drone_position['z']}) already sent, ignoring")
 					else:
-						issue_type = qr_detected(qr_data, base_station_ip)
-						if issue_type:
-							sent_issues.add(issue_key)
-							logging.info(f"[VIDEO] ✓ Stored issue key '{issue_key}' in sent list")
-						else:
-							logging.debug(f"[VIDEO] API {qr_data} did not return issue_type; not storing")
+						try:
+							qr_queue.put_nowait((qr_data, issue_key))
+						except queue.Full:
+							with sent_lock:
+								sent_issues.pop(issue_key, None)
+							logging.debug("[VIDEO] Sender busy; dropping QR sighting")
 				
 				frame_count += 1
 				
@@ -495,9 +705,6 @@ def start_video_detection(stop_event: threading.Event, base_station_ip: str = No
 				if frame_count % 100 == 0:
 					logging.debug(f"[VIDEO] Processing frames... (frame {frame_count})")
 				
-				# Small delay to prevent CPU spinning
-				time.sleep(0.01)
-				
 			except Exception as e:
 				logging.error(f"[VIDEO] Error processing frame: {e}")
 				break
@@ -507,12 +714,19 @@ def start_video_detection(stop_event: threading.Event, base_station_ip: str = No
 	except Exception as e:
 		logging.error(f"[VIDEO] Error in video detection: {e}")
 	finally:
+		pipeline_stop.set()
+		if capture_thread:
+			capture_thread.join(timeout=2)
 		if cap:
 			try:
 				cap.release()
 				logging.info("[VIDEO] ✓ Camera closed")
 			except:
 				pass
+		# These finish once any in-flight lookup or send returns; don't hold shutdown for it
+		for thread in (lookup_thread, report_thread):
+			if thread:
+				thread.join(timeout=2)
 
 
 def cleanup_connections():
@@ -540,16 +754,12 @@ def main():
 	
 	stop_event = threading.Event()
 	
-	# Start heartbeat thread
-	hb_thread = threading.Thread(target=send_heartbeat, args=(base_ip, stop_event), daemon=True)
-	hb_thread.start()
-
 	# Start video detection thread with base_ip for message sending
 	video_thread = threading.Thread(target=start_video_detection, args=(stop_event, base_ip), daemon=True)
 	video_thread.start()
 	
-	# Start message receiver thread
-	msg_thread = threading.Thread(target=receive_messages, args=(stop_event,), daemon=True)
+	# Start message receiver thread (also sends the periodic heartbeat)
+	msg_thread = threading.Thread(target=receive_messages, args=(stop_event, base_ip), daemon=True)
 	msg_thread.start()
 	
 	try:
@@ -559,7 +769,6 @@ def main():
 		logging.info("Shutting down...")
 		stop_event.set()
 		cleanup_connections()
-		hb_thread.join(timeout=5)
 		video_thread.join(timeout=5)
 		msg_thread.join(timeout=5)
 
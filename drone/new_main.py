@@ -8,8 +8,10 @@ import socket
 import time
 import json
 import threading
+import functools
 import logging
 import os
+import struct
 
 
 # ======================== CONFIG ========================
@@ -18,6 +20,10 @@ TCP_ACK_PORT = 9999
 BASE_STATION_TCP_PORT = 9998
 HEARTBEAT_INTERVAL_SEC = 60
 POSITION_UPDATE_INTERVAL_SEC = 1
+# Compact POSITION_UPDATE datagram understood by the base station:
+# tag byte, NUL-padded device_id, x, y, z (little-endian doubles)
+POSITION_UPDATE_TAG = 0x01
+POSITION_UPDATE_STRUCT = struct.Struct('<B32sddd')
 
 # Simulated drone position
 drone_position = {"x": 10.0, "y": 20.0, "z": 15.0}
@@ -34,6 +40,7 @@ message_sender_lock = threading.Lock()
 
 
 # ======================== UTILITIES ========================
+@functools.lru_cache(maxsize=1)
 def get_local_ip() -> str:
     """Get local IP address for network communication"""
     try:
@@ -44,8 +51,13 @@ def get_local_ip() -> str:
         return "127.0.0.1"
 
 
+BATTERY_CAPACITY_PATH = "/sys/class/power_supply/BAT0/capacity"
+_battery_file = None
+
+
 def get_battery_health() -> int:
     """Get drone battery health percentage"""
+    global _battery_file
     val = os.getenv("DRONE_BATTERY")
     if val is not None:
         try:
@@ -54,19 +66,35 @@ def get_battery_health() -> int:
         except ValueError:
             pass
     try:
-        with open("/sys/class/power_supply/BAT0/capacity", "r") as f:
-            val = f.read().strip()
-            if val:
-                v = int(val)
-                return max(0, min(100, v))
+        # Keep the sysfs file open and re-read it from the start on each poll
+        if _battery_file is None:
+            _battery_file = open(BATTERY_CAPACITY_PATH, "r")
+        _battery_file.seek(0)
+        val = _battery_file.read().strip()
+        if val:
+            v = int(val)
+            return max(0, min(100, v))
     except Exception:
-        pass
+        if _battery_file is not None:
+            try:
+                _battery_file.close()
+            except Exception:
+                pass
+        _battery_file = None
     return 100
 
 
 sender_ip = get_local_ip()
 device_id = f"DRONE_{sender_ip.replace('.', '')}"
 
+# Only message_id, timestamp and battery_health change between heartbeats, so the
+# rest of the datagram is formatted once and the varying fields are spliced in
+HEARTBEAT_TEMPLATE = (
+    '{"message_id": "%d", "timestamp": %d, "message_type": "HEARTBEAT", '
+    '"receiver_category": "BASE_STATION", "battery_health": %d, "sender_ip": '
+    + json.dumps(sender_ip) + "}"
+).encode("utf-8")
+
 
 # ======================== COMMUNICATION FUNCTIONS ========================
 
@@ -120,19 +148,21 @@ def wait_for_tcp_ack(listen_port: int = TCP_ACK_PORT, timeout_sec: int = 60) ->
 
     with conn:
         logging.info("TCP connection from %s:%d", addr[0], addr[1])
-        chunks = []
+        # Read until the first newline (or EOF) straight into one buffer
+        buf = bytearray()
         conn.settimeout(10)
-        while True:
+        while b"\n" not in buf:
             try:
-                buf = conn.recv(4096)
-                if not buf:
+                data = conn.recv(4096)
+                if not data:
                     break
-                chunks.append(buf)
+                buf += data
             except socket.timeout:
                 break
 
         try:
-            payload = json.loads(b"".join(chunks).decode("utf-8"))
+            end = buf.find(b"\n")
+            payload = json.loads(buf if end == -1 else buf[:end])
         except Exception as e:
             logging.error("Invalid ACK payload: %s", e)
             srv.close()
@@ -171,15 +201,7 @@ def send_heartbeat(base_station_ip: str, stop_event: threading.Event | None = No
                 return
 
             timestamp = time.time()
-            payload = {
-                "message_id": f"{int(timestamp * 1000000)}",
-                "timestamp": int(timestamp),
-                "message_type": "HEARTBEAT",
-                "receiver_category": "BASE_STATION",
-                "battery_health": get_battery_health(),
-                "sender_ip": sender_ip,
-            }
-            data = json.dumps(payload).encode("utf-8")
+            data = HEARTBEAT_TEMPLATE % (int(timestamp * 1000000), int(timestamp), get_battery_health())
             try:
                 sock.sendto(data, (base_station_ip, UDP_SERVER_PORT))
                 logging.info("Sent HEARTBEAT to %s:%d", base_station_ip, UDP_SERVER_PORT)
@@ -194,29 +216,33 @@ def send_position_update(base_station_ip: str, stop_event: threading.Event | Non
     Send periodic position updates to base station (UDP)
     """
     with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        # Pace against a fixed schedule so send time and sleep overshoot don't add up
+        deadline = time.monotonic()
         while True:
             if stop_event and stop_event.is_set():
                 logging.info("Position updates stopped")
                 return
 
-            timestamp = time.time()
-            payload = {
-                "message_id": f"{int(timestamp * 1000000)}",
-                "timestamp": int(timestamp),
-                "message_type": "POSITION_UPDATE",
-                "device_id": device_id,
-                "device_type": "drone",
-                "sender_ip": sender_ip,
-                "position": drone_position
-            }
-            data = json.dumps(payload).encode("utf-8")
+            data = POSITION_UPDATE_STRUCT.pack(
+                POSITION_UPDATE_TAG,
+                device_id.encode("utf-8"),
+                drone_position["x"],
+                drone_position["y"],
+                drone_position["z"],
+            )
             try:
                 sock.sendto(data, (base_station_ip, UDP_SERVER_PORT))
                 logging.debug(f"Sent position update: {drone_position}")
             except OSError as e:
                 logging.error("Failed to send position update: {e}")
 
-            time.sleep(POSITION_UPDATE_INTERVAL_SEC)
+            deadline += POSITION_UPDATE_INTERVAL_SEC
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind (e.g. the process was stalled); restart the schedule from now
+                deadline = time.monotonic()
 
 
 def send_message_to_base_station(base_station_ip: str, message_type: str, content: dict) -> bool:
@@ -256,6 +282,9 @@ def send_message_to_base_station(base_station_ip: str, message_type: str, conten
                         message_sender_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                         message_sender_socket.settimeout(5)
                         message_sender_socket.connect((base_station_ip, BASE_STATION_TCP_PORT))
+                        # Small newline-framed messages: don't let Nagle hold them back
+                        message_sender_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                        message_sender_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
                         logging.info(f"[SEND] Connected to base station at {base_station_ip}:{BASE_STATION_TCP_PORT}")
                     except Exception as e:
                         logging.error(f"[SEND] Failed to connect: {e}")
@@ -310,18 +339,18 @@ def receive_messages(stop_event: threading.Event) -> None:
                 logging.info(f"[MESSAGE] Incoming connection from {client_ip}")
 
                 try:
-                    buffer = ""
+                    buffer = bytearray()
                     while True:
                         data = client_sock.recv(4096)
                         if not data:
                             break
 
-                        buffer += data.decode('utf-8', errors='ignore')
+                        buffer += data
 
                         # Process complete messages (separated by newlines)
-                        while '\n' in buffer:
-                            line, buffer = buffer.split('\n', 1)
-                            line = line.strip()
+                        while (idx := buffer.find(b'\n')) != -1:
+                            line = bytes(buffer[:idx]).strip()
+                            del buffer[:idx + 1]
 
                             if not line:
                                 continue
@@ -332,7 +361,7 @@ def receive_messages(stop_event: threading.Event) -> None:
                                 logging.info(f"[MESSAGE] Received: {message_type}")
                                 logging.debug(f"[MESSAGE] Payload: {msg}")
 
-                            except json.JSONDecodeError as e:
+                            except ValueError as e:
                                 logging.error(f"[MESSAGE] Failed to parse JSON: {e}")
 
                 except Exception as e:
@@ -2,8 +2,10 @@ import socket
 import time
 import json
 import threading
+import functools
 import logging
 import os
+import struct
 import serial
 import subprocess
 
@@ -13,6 +15,10 @@ TCP_ACK_PORT = 9999          # Port for receiving ACK from base station
 BASE_STATION_TCP_PORT = 9998  # Port for sending messages TO base station
 HEARTBEAT_INTERVAL_SEC = 60
 POSITION_UPDATE_INTERVAL_SEC = 5
+# Compact POSITION_UPDATE datagram understood by the base station:
+# tag byte, NUL-padded device_id, x, y, z (little-endian doubles)
+POSITION_UPDATE_TAG = 0x01
+POSITION_UPDATE_STRUCT = struct.Struct('<B32sddd')
 ROBOT_TYPE = "TYPE1"  # Set to TYPE1 or TYPE2 based on robot capabilities
 
 # Robot position (simulated - in real scenario would come from sensors/localization)
@@ -464,6 +470,7 @@ def type2_detected_movement():
                 return False
 
 
+@functools.lru_cache(maxsize=1)
 def get_local_ip() -> str:
         try:
                 with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
@@ -476,6 +483,14 @@ def get_local_ip() -> str:
 sender_ip = get_local_ip()
 device_id = f"ROBOT_{sender_ip.replace('.', '')}"
 
+# Only message_id, timestamp and battery_health change between heartbeats, so the
+# rest of the datagram is formatted once and the varying fields are spliced in
+HEARTBEAT_TEMPLATE = (
+        '{"message_id": "%d", "timestamp": %d, "message_type": "HEARTBEAT", '
+        '"receiver_category": "BASE_STATION", "battery_health": %d, "sender_ip": '
+        + json.dumps(sender_ip) + "}"
+).encode("utf-8")
+
 # Persistent connection to base station for sending messages
 message_sender_socket = None
 message_sender_lock = threading.Lock()
@@ -559,19 +574,21 @@ def wait_for_tcp_ack(listen_port: int = TCP_ACK_PORT, timeout_sec: int = 60) ->
 
         with conn:
                 logging.info("TCP connection from %s:%d", addr[0], addr[1])
-                chunks = []
+                # Read until the first newline (or EOF) straight into one buffer
+                buf = bytearray()
                 conn.settimeout(10)
-                while True:
+                while b"\n" not in buf:
                         try:
-                                buf = conn.recv(4096)
-                                if not buf:
+                                data = conn.recv(4096)
+                                if not data:
                                         break
-                                chunks.append(buf)
+                                buf += data
                         except socket.timeout:
                                 break
 
                 try:
-                        payload = json.loads(b"".join(chunks).decode("utf-8"))
+                        end = buf.find(b"\n")
+                        payload = json.loads(buf if end == -1 else buf[:end])
                 except Exception as e:
                         logging.error("Invalid ACK payload: %s", e)
                         srv.close()
@@ -598,7 +615,12 @@ def wait_for_tcp_ack(listen_port: int = TCP_ACK_PORT, timeout_sec: int = 60) ->
         return base_ip
 
 
+BATTERY_CAPACITY_PATH = "/sys/class/power_supply/BAT0/capacity"
+_battery_file = None
+
+
 def get_battery_health() -> int:
+        global _battery_file
         # Try environment variable first
         val = os.getenv("ROBOT_BATTERY")
         if val is not None:
@@ -610,21 +632,27 @@ def get_battery_health() -> int:
 
         # Try Ubuntu battery file
         try:
-                with open("/sys/class/power_supply/BAT0/capacity", "r") as f:
-                        val = f.read().strip()
-                        if val:
-                                v = int(val)
-                                return max(0, min(100, v))
+                # Keep the sysfs file open and re-read it from the start on each poll
+                if _battery_file is None:
+                        _battery_file = open(BATTERY_CAPACITY_PATH, "r")
+                _battery_file.seek(0)
+                val = _battery_file.read().strip()
+                if val:
+                        v = int(val)
+                        return max(0, min(100, v))
         except Exception:
-                pass
+                if _battery_file is not None:
+                        try:
+                                _battery_file.close()
+                        except Exception:
+                                pass
+                _battery_file = None
 
         # Default fallback
         return 100
 
 
 def send_heartbeat(base_station_ip: str, stop_event: threading.Event | None = None) -> None:
-        sender_ip = get_local_ip()
-
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
                 while True:
                         if stop_event and stop_event.is_set():
@@ -632,15 +660,7 @@ def send_heartbeat(base_station_ip: str, stop_event: threading.Event | None = No
                                 return
 
                         timestamp = time.time()
-                        payload = {
-                                "message_id": f"{int(timestamp * 1000000)}",
-                                "timestamp": int(timestamp),
-                                "message_type": "HEARTBEAT",
-                                "receiver_category": "BASE_STATION",
-                                "battery_health": get_battery_health(),
-                                "sender_ip": sender_ip,
-                        }
-                        data = json.dumps(payload).encode("utf-8")
+                        data = HEARTBEAT_TEMPLATE % (int(timestamp * 1000000), int(timestamp), get_battery_health())
                         try:
                                 sock.sendto(data, (base_station_ip, UDP_SERVER_PORT))
                                 logging.info("Sent HEARTBEAT to %s:%d", base_station_ip, UDP_SERVER_PORT)
@@ -652,9 +672,9 @@ def send_heartbeat(base_station_ip: str, stop_event: threading.Event | None = No
 
 def send_position_update(base_station_ip: str, stop_event: threading.Event) -> None:
         """Send position updates to base station every 5 seconds (no logging in dashboard)"""
-        sender_ip = get_local_ip()
-
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                # Pace against a fixed schedule so send time and sleep overshoot don't add up
+                deadline = time.monotonic()
                 while True:
                         if stop_event and stop_event.is_set():
                                 logging.info("[POSITION] Position updates stopped")
@@ -663,20 +683,25 @@ def send_position_update(base_station_ip: str, stop_event: threading.Event) -> N
                         try:
                                 # Simulate robot movement (optional - you can implement actual position tracking)
                                 # For now, we'll send fixed position
-                                payload = {
-                                        "message_type": "POSITION_UPDATE",
-                                        "device_id": device_id,
-                                        "device_type": "robot",
-                                        "sender_ip": sender_ip,
-                                        "position": robot_position
-                                }
-                                data = json.dumps(payload).encode("utf-8")
+                                data = POSITION_UPDATE_STRUCT.pack(
+                                        POSITION_UPDATE_TAG,
+                                        device_id.encode("utf-8"),
+                                        robot_position["x"],
+                                        robot_position["y"],
+                                        robot_position["z"],
+                                )
                                 sock.sendto(data, (base_station_ip, UDP_SERVER_PORT))
                                 logging.debug(f"[POSITION] Sent position update: {robot_position}")
                         except OSError as e:
                                 logging.error(f"[POSITION] Failed to send position update: {e}")
 
-                        time.sleep(POSITION_UPDATE_INTERVAL_SEC)
+                        deadline += POSITION_UPDATE_INTERVAL_SEC
+                        delay = deadline - time.monotonic()
+                        if delay > 0:
+                                time.sleep(delay)
+                        else:
+                                # Fell behind (e.g. the process was stalled); restart the schedule from now
+                                deadline = time.monotonic()
 
 
 def send_message_to_base_station(base_station_ip: str, message_type: str, content: dict):
@@ -707,6 +732,9 @@ def send_message_to_base_station(base_station_ip: str, message_type: str, conten
                                                 message_sender_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                                                 message_sender_socket.settimeout(5)
                                                 message_sender_socket.connect((base_station_ip, BASE_STATION_TCP_PORT))
+                                                # Small newline-framed messages: don't let Nagle hold them back
+                                                message_sender_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                                                message_sender_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
                                                 logging.info(f"[SEND] Connected to base station at {base_station_ip}:{BASE_STATION_TCP_PORT}")
                                         except Exception as e:
                                                 logging.error(f"[SEND] Failed to connect: {e}")
@@ -879,18 +907,22 @@ def receive_messages(stop_event: threading.Event, base_station_ip: str = None) -
 
                                 # Handle the incoming message (newline-delimited JSON)
                                 try:
-                                        buffer = ""
+                                        buffer = bytearray()
                                         while True:
                                                 data = client_sock.recv(4096)
                                                 if not data:
                                                         break
 
-                                                buffer += data.decode('utf-8', errors='ignore')
+                                                buffer.extend(data)
 
-                                                # Process complete messages (separated by newlines)
-                                                while '\n' in buffer:
-                                                        line, buffer = buffer.split('\n', 1)
-                                                        line = line.strip()
+                                                # Process complete messages (separated by newlines); only
+                                                # finished lines are decoded, the tail stays in the buffer
+                                                while True:
+                                                        nl = buffer.find(b'\n')
+                                                        if nl < 0:
+                                                                break
+                                                        line = bytes(buffer[:nl]).strip()
+                                                        del buffer[:nl + 1]
 
                                                         if not line:
                                                                 continue
@@ -911,7 +943,8 @@ def receive_messages(stop_event: threading.Event, base_station_ip: str = None) -
                                                                         handle_forward_message(msg)
                                                                 else:
                                                                         logging.info(f"[MESSAGE] Received: {message_type}")
-                                                        except json.JSONDecodeError:
+                                                        except ValueError:
+                                                                # Malformed JSON or invalid UTF-8
                                                                 pass
 
                                 except Exception as e: